@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query
-from kiteconnect import KiteConnect
+from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
 import os
+import hashlib
+import httpx
 from core.state_store import StateStore
+from api.deps import get_state_store
 
 router = APIRouter(prefix="/auth/kite", tags=["Authentication"])
 
@@ -11,12 +14,57 @@ API_KEY = os.getenv("KITE_API_KEY")
 API_SECRET = os.getenv("KITE_API_SECRET")
 REDIRECT_URL = os.getenv("KITE_REDIRECT_URL", "http://localhost:8000/api/auth/kite/callback")
 
-# Initialize StateStore for token persistence
-state_store = StateStore("state/run_state.json")
+KITE_API_ROOT = "https://api.kite.trade"
+
+# One pooled client per process so the TLS connection to Kite is reused across logins
+_kite_http = None
+
+def get_kite_http() -> httpx.AsyncClient:
+    global _kite_http
+    if _kite_http is None:
+        _kite_http = httpx.AsyncClient(
+            base_url=KITE_API_ROOT,
+            timeout=10,
+            headers={"X-Kite-Version": "3"},
+        )
+    return _kite_http
+
+async def close_kite_http():
+    """Closes the pooled client; called from the app's lifespan on shutdown."""
+    global _kite_http
+    if _kite_http is not None:
+        await _kite_http.aclose()
+        _kite_http = None
+
+async def generate_session(request_token: str) -> dict:
+    """
+    Async equivalent of KiteConnect.generate_session over the pooled client.
+    """
+    if not API_KEY or not API_SECRET:
+        raise ValueError("KITE_API_KEY and KITE_API_SECRET must be set")
+    checksum = hashlib.sha256((API_KEY + request_token + API_SECRET).encode("utf-8")).hexdigest()
+    response = await get_kite_http().post("/session/token", data={
+        "api_key": API_KEY,
+        "request_token": request_token,
+        "checksum": checksum
+    })
+    if response.status_code != 200:
+        # Error bodies are not always JSON (e.g. an HTML 502 from a proxy)
+        try:
+            message = response.json().get("message")
+        except ValueError:
+            message = None
+        raise ValueError(message or f"HTTP {response.status_code}")
+    payload = response.json()
+    if payload.get("status") != "success":
+        raise ValueError(payload.get("message", "Kite session request failed"))
+    return payload["data"]
 
 def get_kite_client():
     if not API_KEY:
         raise HTTPException(status_code=500, detail="KITE_API_KEY not configured")
+    # Imported lazily: only the auth routes need the SDK, so API startup doesn't pay for it
+    from kiteconnect import KiteConnect
     return KiteConnect(api_key=API_KEY)
 
 @router.get("/login")
@@ -26,21 +74,28 @@ def login():
     return {"login_url": kite.login_url()}
 
 @router.get("/callback")
-def callback(request_token: str = Query(..., description="Token from Zerodha redirect")):
+async def callback(request_token: str = Query(..., description="Token from Zerodha redirect"),
+                   state_store: StateStore = Depends(get_state_store)):
     """Exchanges request_token for access_token."""
-    kite = get_kite_client()
+    if not API_KEY:
+        raise HTTPException(status_code=500, detail="KITE_API_KEY not configured")
+    if not API_SECRET:
+        raise HTTPException(status_code=500, detail="KITE_API_SECRET not configured")
     try:
-        data = kite.generate_session(request_token, api_secret=API_SECRET)
+        data = await generate_session(request_token)
         access_token = data["access_token"]
         
         # Persist token securely (notionally)
         # In a real app, encrypt this. Here we store in our localized state store.
-        state_store.set("kite_access_token", access_token)
-        state_store.set("kite_public_token", data.get("public_token"))
-        state_store.set("kite_user_data", {
-            "user_id": data.get("user_id"),
-            "user_name": data.get("user_name"),
-            "login_time": data.get("login_time")
+        # The store fsyncs its file, so the write runs off the event loop.
+        await asyncio.to_thread(state_store.update, {
+            "kite_access_token": access_token,
+            "kite_public_token": data.get("public_token"),
+            "kite_user_data": {
+                "user_id": data.get("user_id"),
+                "user_name": data.get("user_name"),
+                "login_time": data.get("login_time")
+            }
         })
         
         return {
@@ -52,7 +107,7 @@ def callback(request_token: str = Query(..., description="Token from Zerodha red
         raise HTTPException(status_code=400, detail=f"Authentication failed: {str(e)}")
 
 @router.get("/token")
-def get_current_token():
+def get_current_token(state_store: StateStore = Depends(get_state_store)):
     """Returns the current active access token (for frontend)."""
     token = state_store.get("kite_access_token")
     if not token:
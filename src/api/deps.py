@@ -0,0 +1,21 @@
+from functools import lru_cache
+
+from core.state_store import StateStore
+from core.registry import ModelRegistry
+from ops.health import HealthMonitor
+
+# Process-wide singletons shared by every router via Depends().
+# Both the core API and the auth router read the same run_state.json,
+# so one in-memory view avoids divergent copies and repeated parsing.
+
+@lru_cache(maxsize=1)
+def get_state_store() -> StateStore:
+    return StateStore("state/run_state.json")
+
+@lru_cache(maxsize=1)
+def get_registry() -> ModelRegistry:
+    return ModelRegistry()
+
+@lru_cache(maxsize=1)
+def get_health_monitor() -> HealthMonitor:
+    return HealthMonitor()
@@ -1,17 +1,41 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 import pandas as pd
+import numpy as np
 import os
 import sys
+import csv
 import json
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import PROCESSED_DATA_DIR, RAW_DATA_DIR, COMMODITIES
-from api.auth import router as auth_router
+from api.auth import router as auth_router, close_kite_http
 
-app = FastAPI(title="Commodity Intelligence API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Requests read the cached USDINR scalar; only the refresher task talks to Yahoo
+    app.state.usdinr = USDINR_FALLBACK
+    app.state.usdinr_as_of = None
+    fx_task = asyncio.create_task(_refresh_usdinr(app))
+    try:
+        yield
+    finally:
+        fx_task.cancel()
+        await close_kite_http()
+
+app = FastAPI(title="Commodity Intelligence API", default_response_class=ORJSONResponse,
+              lifespan=lifespan)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -27,19 +51,17 @@ app.include_router(auth_router, prefix="/api")
 from core.state_store import StateStore
 from core.registry import ModelRegistry
 from ops.health import HealthMonitor
-
-# Initialize core components
-# Note: In a production setup, these would be managed via dependency injection
-state = StateStore("state/run_state.json")
-registry = ModelRegistry()
-health = HealthMonitor()
+from core.arrow_cache import get_table, write_sidecar
+from utils.downsample import lttb_indices
+from api.deps import get_state_store, get_registry, get_health_monitor
 
 @app.get("/health")
-def health_check():
+def health_check(health: HealthMonitor = Depends(get_health_monitor)):
     return health.get_system_status()
 
 @app.get("/api/system-status")
-def get_system_status():
+def get_system_status(state: StateStore = Depends(get_state_store),
+                      health: HealthMonitor = Depends(get_health_monitor)):
     """Returns sovereignty metrics for the command center."""
     last_cycle = state.get("last_successful_cycle")
     health_status = health.get_system_status()
@@ -52,7 +74,7 @@ def get_system_status():
     }
 
 @app.get("/api/registry")
-def get_registry_info():
+def get_registry_info(registry: ModelRegistry = Depends(get_registry)):
     """Returns information about the active champion model."""
     champion = registry.get_champion("tcn_gold")
     return {
@@ -60,80 +82,143 @@ def get_registry_info():
         "target": "GOLD"
     }
 
+MARKET_DATA_TAIL = 50 # Points returned per ticker
+MAX_CHART_POINTS = 500 # Longer windows are LTTB-downsampled to this many points
+
+def _read_close_csv(path: str) -> pa.Table:
+    """
+    Reads only the Close columns of a yfinance multi-index CSV.
+    Rows 0-1 are the (Price, Ticker) header and an optional third row holds the
+    index name; the header is sniffed once and Arrow skips every other column.
+    """
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        fields, tickers = next(reader), next(reader)
+        third = next(reader, [''])
+    skip_rows = 2 if third[0][:1].isdigit() else 3
+    
+    names = ["Datetime"] + [f"{p}|{t}" for p, t in zip(fields[1:], tickers[1:])]
+    close_cols = [n for n in names[1:] if n.startswith("Close|")]
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(skip_rows=skip_rows, column_names=names),
+        convert_options=pacsv.ConvertOptions(include_columns=["Datetime"] + close_cols),
+    )
+    return table.rename_columns(["Datetime"] + [c.split("|", 1)[1] for c in close_cols])
+
+def _load_close(path: str, tail: int = MARKET_DATA_TAIL) -> pd.DataFrame:
+    """
+    Loads the latest Close prices from the raw intraday file.
+    The Close panel is persisted once as a Parquet sidecar (rewritten when the
+    CSV is newer) and served from the shared Arrow cache; only the tail is
+    materialized in pandas.
+    """
+    sidecar = write_sidecar(path, os.path.splitext(path)[0] + "_close.parquet", _read_close_csv)
+    table = get_table(sidecar)
+    table = table.slice(max(0, table.num_rows - tail))
+    return table.to_pandas(split_blocks=True, self_destruct=True).set_index("Datetime")
+
+def _market_data_payload(path: str, tail: int = MARKET_DATA_TAIL,
+                         max_points: int = MAX_CHART_POINTS) -> dict:
+    # We focus on the 'Close' price, last `tail` points
+    close_df = _load_close(path, tail)
+    
+    # Format the shared index once instead of per (ticker, timestamp) cell
+    ts_strs = np.array(close_df.index.astype(str).tolist(), dtype=object)
+    bar_pos = np.arange(len(close_df)) # Charts plot bars evenly spaced
+    
+    result = {}
+    for ticker in close_df.columns:
+        # Flatten to a simple list of {timestamp, price}
+        prices = close_df[ticker].to_numpy(dtype=float)
+        valid = np.flatnonzero(~np.isnan(prices))
+        if len(valid) > max_points:
+            # Keep the chart's shape but cap what is serialized and drawn
+            valid = valid[lttb_indices(bar_pos[valid], prices[valid], max_points)]
+        result[ticker] = [
+            {"timestamp": ts, "price": price, "ticker": ticker}
+            for ts, price in zip(ts_strs[valid].tolist(), prices[valid].tolist())
+        ]
+    return result
+
 @app.get("/api/market-data")
-# ... (rest of the file)
-def get_market_data():
-    """Returns latest intraday price data."""
+async def get_market_data(tail: int = Query(MARKET_DATA_TAIL, ge=1),
+                          max_points: int = Query(MAX_CHART_POINTS, ge=3)):
+    """Returns latest intraday price data, downsampled to at most max_points per ticker."""
     path = os.path.join(RAW_DATA_DIR, "commodities_1h_raw.csv")
     if not os.path.exists(path):
         raise HTTPException(status_code=404, detail="Market data not found")
     
-    # yfinance multi-index CSV: header=[0, 1] means Price and Ticker
-    # index_col=0 is the Datetime
+    # Parsing is blocking; keep it off the event loop
     try:
-        df = pd.read_csv(path, header=[0, 1], index_col=0, parse_dates=True)
-        
-        # We focus on the 'Close' price
-        close_df = df['Close']
-        close_df = close_df.tail(50) # Last 50 points
-        
-        result = {}
-        for ticker in close_df.columns:
-            # Flatten to a simple list of {timestamp, price}
-            ticker_data = []
-            for ts, price in close_df[ticker].items():
-                if pd.notna(price):
-                    ticker_data.append({
-                        "timestamp": str(ts),
-                        "price": float(price),
-                        "ticker": ticker
-                    })
-            result[ticker] = ticker_data
-            
-        return result
+        return await asyncio.to_thread(_market_data_payload, path, tail, max_points)
     except Exception as e:
         print(f"Error parsing market data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _predictions_payload(path: str) -> dict:
+    table = get_table(path)
+    table = table.slice(max(0, table.num_rows - 20)) # Latest 20 predictions
+    
+    # Pull whole columns out of Arrow; no DataFrame is built per request
+    dates = pc.strftime(table.column(0), format='%Y-%m-%d').to_pylist()
+    p05, p50, p95 = (pc.divide(table[q].cast(pa.float64()), 10000.0).to_pylist()
+                     for q in ('0.05', '0.5', '0.95'))
+    
+    return {
+        "GC=F": [
+            {"date": d, "p05": a, "p50": b, "p95": c}
+            for d, a, b, c in zip(dates, p05, p50, p95)
+        ]
+    }
+
 @app.get("/api/predictions")
-def get_predictions():
+async def get_predictions():
     """Returns latest quantile forecasts."""
     # For now, focusing on Gold as it's our primary model
     path = os.path.join(PROCESSED_DATA_DIR, "tcn_gold_preds.csv")
     if not os.path.exists(path):
         return {"GOLD": []}
     
-    df = pd.read_csv(path, index_col=0, parse_dates=True)
-    df = df.tail(20) # Latest 20 predictions
+    return await asyncio.to_thread(_predictions_payload, path)
+
+NEWS_TAIL = 15 # Latest headlines returned
+
+@functools.lru_cache(maxsize=1)
+def _load_news(path: str, mtime: float) -> list:
+    """
+    Returns the latest headlines, memoized on the file mtime.
+    Works on the shared Arrow table: a top-k selection picks the newest rows
+    (no full sort) and only those are turned into Python dicts.
+    """
+    table = get_table(path)
+    k = min(NEWS_TAIL, table.num_rows)
+    indices = pc.select_k_unstable(table, k=k, sort_keys=[("timestamp_utc", "descending")])
+    table = table.take(indices)
     
-    return {
-        "GC=F": [{
-            "date": str(index.date()),
-            "p05": row['0.05'] / 10000.0,
-            "p50": row['0.5'] / 10000.0,
-            "p95": row['0.95'] / 10000.0
-        } for index, row in df.iterrows()]
-    }
+    # Fill missing relevance_prob if it exists
+    if 'relevance_prob' in table.column_names:
+        pos = table.column_names.index('relevance_prob')
+        filled = pc.fill_null(table['relevance_prob'].cast(pa.float64()), 0.5)
+        table = table.set_column(pos, 'relevance_prob', filled)
+    else:
+        table = table.append_column('relevance_prob', pa.array([0.5] * table.num_rows))
+        
+    return table.to_pylist()
 
 @app.get("/api/news")
-def get_news():
+async def get_news():
     """Returns latest news with sentiment scores."""
     path = os.path.join(PROCESSED_DATA_DIR, "news_with_intel.csv")
     if not os.path.exists(path):
         return []
     
-    df = pd.read_csv(path)
-    # Sort by timestamp and get latest 10
-    df['timestamp_utc'] = pd.to_datetime(df['timestamp_utc'])
-    df = df.sort_values('timestamp_utc', ascending=False).head(15)
-    
-    # Fill NaN relevance_prob if it exists
-    if 'relevance_prob' in df.columns:
-        df['relevance_prob'] = df['relevance_prob'].fillna(0.5)
-    else:
-        df['relevance_prob'] = 0.5
-        
-    return df.to_dict(orient='records')
+    return await asyncio.to_thread(_load_news, path, os.path.getmtime(path))
+
+# Demo shocks, serialized once at import
+_DEMO_SHOCKS_JSON = orjson.dumps([
+    {"timestamp": "2026-01-18 10:00:00", "ticker": "GC=F", "magnitude": -0.012, "type": "NEGATIVE_SHOCK"}
+])
 
 @app.get("/api/shocks")
 def get_shocks():
@@ -142,9 +227,55 @@ def get_shocks():
     # For simplicity, we'll re-detect from intraday data or return mock shocks if none
     # In a full system, run_live_intelligence would persist these.
     # Let's check if a shocks file exists, if not return demo shocks.
-    return [
-        {"timestamp": "2026-01-18 10:00:00", "ticker": "GC=F", "magnitude": -0.012, "type": "NEGATIVE_SHOCK"}
-    ]
+    return Response(content=_DEMO_SHOCKS_JSON, media_type="application/json")
+
+USDINR_FALLBACK = 84.0
+FX_REFRESH_SECONDS = 300
+
+# Ticker -> (INR display unit, quote units per display unit); USD-quoted futures
+_CONV = MappingProxyType({
+    "GC=F": ("INR / 1g", 1 / 31.1034768),   # troy oz -> gram
+    "SI=F": ("INR / 1kg", 32.1507466),      # troy oz -> kilogram
+    "HG=F": ("INR / 1kg", 2.20462262),      # lb -> kilogram
+    "CL=F": ("INR / 1bbl", 1.0),
+})
+_CONV_DEFAULT = ("INR (derived)", 1.0)
+
+def _fetch_usdinr_scalar() -> float:
+    """Latest USDINR close from Yahoo."""
+    import yfinance as yf # Deferred: only the background refresher needs it
+    df = yf.download("USDINR=X", period="1d", interval="1h", progress=False)
+    closes = np.asarray(df['Close'], dtype=float).ravel()
+    closes = closes[~np.isnan(closes)]
+    if closes.size == 0:
+        raise ValueError("No USDINR quotes returned")
+    return float(closes[-1])
+
+async def _refresh_usdinr(app):
+    while True:
+        try:
+            app.state.usdinr = await asyncio.to_thread(_fetch_usdinr_scalar)
+            app.state.usdinr_as_of = pd.Timestamp.utcnow().isoformat()
+        except Exception as e:
+            print(f"USDINR refresh failed: {e}")
+        await asyncio.sleep(FX_REFRESH_SECONDS)
+
+@app.get("/api/fx")
+def get_fx():
+    """
+    Returns the latest cached USDINR rate and, per ticker, the single factor
+    that turns a USD quote into its INR display unit (price_inr = price * factor).
+    """
+    usdinr = getattr(app.state, "usdinr", USDINR_FALLBACK)
+    return {
+        "USDINR": usdinr,
+        "as_of": getattr(app.state, "usdinr_as_of", None),
+        "inr_units": {
+            ticker: {"unit": unit, "factor": usdinr * factor}
+            for ticker, (unit, factor) in _CONV.items()
+        },
+        "default_unit": {"unit": _CONV_DEFAULT[0], "factor": usdinr * _CONV_DEFAULT[1]}
+    }
 
 @app.get("/api/live-order")
 def get_live_order():
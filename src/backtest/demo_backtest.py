@@ -16,21 +16,9 @@ def create_dummy_data():
     price = 100 * (1 + np.random.normal(0, 0.01, size=len(dates))).cumprod()
     market_df = pd.DataFrame({'GOLD': price}, index=dates)
     
-    # Allocations (Signal: Alternate Long/Flat every 10 days)
-    allocations = []
-    for i, date in enumerate(dates):
-        if (i // 10) % 2 == 0:
-            weight = 0.5 # 50% Long
-        else:
-            weight = 0.0 # Flat
-            
-        allocations.append({
-            'date': date,
-            'asset': 'GOLD',
-            'weight': weight
-        })
-        
-    alloc_df = pd.DataFrame(allocations)
+    # Allocations (Signal: Alternate 50% Long / Flat every 10 days)
+    weights = np.where((np.arange(len(dates)) // 10) % 2 == 0, 0.5, 0.0)
+    alloc_df = pd.DataFrame({'date': dates, 'asset': 'GOLD', 'weight': weights})
     return market_df, alloc_df
 
 def main():
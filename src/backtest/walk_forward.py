@@ -1,13 +1,16 @@
 import pandas as pd
 import numpy as np
 import datetime
+from scipy.stats import spearmanr
 from sklearn.metrics import mean_squared_error, mean_absolute_error
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Add src to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import PROCESSED_DATA_DIR, WALK_FORWARD_CONFIG
+from utils.jit import njit, prange
 
 class WalkForwardSplitter:
     """
@@ -23,48 +26,48 @@ class WalkForwardSplitter:
         Generator yielding (train_df, test_df).
         """
         # Ensure data is sorted
-        data = data.sort_index()
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
         dates = data.index
         
-        start_date = dates[0]
-        end_date = dates[-1]
+        for train_lo, train_hi, test_hi in zip(*self.bounds(dates)):
+            # The test window starts at the first bar after the training window
+            if train_hi > train_lo and test_hi > train_hi:
+                yield data.iloc[train_lo:train_hi], data.iloc[train_hi:test_hi]
+                
+    def bounds(self, dates: pd.DatetimeIndex):
+        """
+        Row bounds of every fold at once: (train_lo, train_hi, test_hi) arrays,
+        hi exclusive; the test window is rows [train_hi, test_hi).
+        """
+        train = pd.Timedelta(days=self.train_window)
+        test = pd.Timedelta(days=self.test_window)
+        step = pd.Timedelta(days=self.step)
         
-        current_train_start = start_date
+        # Folds whose test window still ends inside the data
+        span = dates[-1] - dates[0] - train - test
+        n_folds = span // step + 1 if span >= pd.Timedelta(0) else 0
         
-        while True:
-            train_end = current_train_start + datetime.timedelta(days=self.train_window)
-            test_start = train_end + datetime.timedelta(hours=1) # Next hour? or Next Day? 
-            # If freq is daily, next day. 
-            test_end = test_start + datetime.timedelta(days=self.test_window)
-            
-            if test_end > end_date:
-                break
-                
-            train_mask = (dates >= current_train_start) & (dates <= train_end)
-            test_mask = (dates >= test_start) & (dates <= test_end)
-            
-            train_df = data[train_mask]
-            test_df = data[test_mask]
-            
-            if not train_df.empty and not test_df.empty:
-                yield train_df, test_df
-                
-            current_train_start += datetime.timedelta(days=self.step)
+        train_starts = dates[0] + step * np.arange(n_folds)
+        train_ends = train_starts + train
+        test_ends = train_ends + test
+        
+        return (dates.searchsorted(train_starts, side='left'),
+                dates.searchsorted(train_ends, side='right'),
+                dates.searchsorted(test_ends, side='right'))
 
 
-def get_walk_forward_splits(df, config):
+def get_walk_forward_bounds(dates: pd.DatetimeIndex, config):
     """
-    Generates train/test splits for walk-forward validation (Legacy Function).
+    Integer row bounds of each walk-forward split on a sorted index:
+    a list of (test_year, train_lo, train_hi, test_lo, test_hi), hi exclusive.
     """
-    splits = []
+    bounds = []
     start_year = config["start_year"]
     train_size = config["train_size_years"]
     test_size = config["test_size_years"]
     
-    # Get total years in df
-    df_years = df.index.year.unique().sort_values()
-    max_year = df_years.max()
-    
+    max_year = dates[-1].year
     current_test_year = start_year + train_size
     
     while current_test_year <= max_year:
@@ -74,62 +77,142 @@ def get_walk_forward_splits(df, config):
         test_end = datetime.datetime(current_test_year + test_size - 1, 12, 31)
         
         # Clip to available data
-        train_df = df[(df.index >= train_start) & (df.index <= train_end)]
-        test_df = df[(df.index >= test_start) & (df.index <= test_end)]
-        
-        if not test_df.empty:
-            splits.append({
-                "test_year": current_test_year,
-                "train": train_df,
-                "test": test_df
-            })
+        test_lo = dates.searchsorted(test_start, side='left')
+        test_hi = dates.searchsorted(test_end, side='right')
+        if test_hi > test_lo:
+            bounds.append((
+                current_test_year,
+                dates.searchsorted(train_start, side='left'),
+                dates.searchsorted(train_end, side='right'),
+                test_lo,
+                test_hi
+            ))
             
         current_test_year += test_size
         
-    return splits
+    return bounds
+
+def get_walk_forward_splits(df, config):
+    """
+    Generates train/test splits for walk-forward validation (Legacy Function).
+    """
+    # Bounds are binary searches, which need a sorted index
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    
+    return [
+        {
+            "test_year": year,
+            "train": df.iloc[train_lo:train_hi],
+            "test": df.iloc[test_lo:test_hi]
+        }
+        for year, train_lo, train_hi, test_lo, test_hi in get_walk_forward_bounds(df.index, config)
+    ]
+
+def _split_metrics(year, preds, y_test):
+    # Metrics
+    rmse = np.sqrt(mean_squared_error(y_test, preds))
+    mae = mean_absolute_error(y_test, preds)
+    
+    # Information Coefficient (Rank Correlation) - important for finance
+    ic = spearmanr(preds, y_test).statistic
+    
+    return {
+        "year": year,
+        "rmse": rmse,
+        "mae": mae,
+        "ic": ic
+    }
 
-def run_backtest(model_class, df, target_col, feature_cols, config):
+def _run_one_split(model_class, year, X_train, y_train, X_test, y_test):
+    """
+    Fits and scores one walk-forward split. Module-level so it can be shipped
+    to worker processes; returns (metrics, preds, actuals).
+    """
+    # Fit model
+    model = model_class()
+    model.fit(X_train, y_train)
+    
+    # Predict
+    preds = model.predict(X_test)
+    
+    return _split_metrics(year, preds, y_test), preds, y_test
+
+@njit(parallel=True)
+def _parallel_eval(X_all, y_all, bounds, fit_fn, predict_fn):
+    """
+    Fits and predicts every split on threads. bounds rows are
+    (train_lo, train_hi, test_lo, test_hi); test windows do not overlap, so
+    each split writes its own slice of the returned prediction vector.
+    """
+    preds = np.full(y_all.shape[0], np.nan)
+    for s in prange(bounds.shape[0]):
+        train_lo, train_hi, test_lo, test_hi = bounds[s, 0], bounds[s, 1], bounds[s, 2], bounds[s, 3]
+        coef = fit_fn(X_all[train_lo:train_hi], y_all[train_lo:train_hi])
+        preds[test_lo:test_hi] = predict_fn(X_all[test_lo:test_hi], coef)
+    return preds
+
+def _run_numba_splits(kernels, X_all, y_all, bounds):
+    """Evaluates a model exposing njit (fit, predict) kernels on all splits at once."""
+    fit_fn, predict_fn = kernels
+    X_all = np.ascontiguousarray(X_all, dtype=np.float64)
+    y_all = np.ascontiguousarray(y_all, dtype=np.float64)
+    bounds_arr = np.array([b[1:] for b in bounds], dtype=np.int64).reshape(-1, 4)
+    
+    preds = _parallel_eval(X_all, y_all, bounds_arr, fit_fn, predict_fn)
+    return [
+        (_split_metrics(year, preds[test_lo:test_hi], y_all[test_lo:test_hi]),
+         preds[test_lo:test_hi], y_all[test_lo:test_hi])
+        for year, _, _, test_lo, test_hi in bounds
+    ]
+
+def run_backtest(model_class, df, target_col, feature_cols, config, max_workers=1):
     """
     Runs backtest for a specific model class across all splits.
+    model_class().fit/predict receive the split's feature DataFrame and target
+    Series, as before. Splits are independent: max_workers > 1 (or None for
+    one per core) fits them in parallel processes, which requires a picklable,
+    module-level model_class. Models that expose njit
+    `numba_kernels = (fit_fn, predict_fn)` are instead run on threads via prange.
     """
-    splits = get_walk_forward_splits(df, config)
-    results = []
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
     
-    all_predictions = []
-    all_actuals = []
+    # Select the columns once; every split is a positional row slice of them
+    X_frame = df[feature_cols]
+    y_series = df[target_col]
+    bounds = get_walk_forward_bounds(df.index, config)
+    tasks = [
+        (model_class, year,
+         X_frame.iloc[train_lo:train_hi], y_series.iloc[train_lo:train_hi],
+         X_frame.iloc[test_lo:test_hi], y_series.iloc[test_lo:test_hi])
+        for year, train_lo, train_hi, test_lo, test_hi in bounds
+    ]
     
-    for split in splits:
-        year = split["test_year"]
-        X_train = split["train"][feature_cols]
-        y_train = split["train"][target_col]
-        X_test = split["test"][feature_cols]
-        y_test = split["test"][target_col]
-        
-        # Fit model
-        model = model_class()
-        model.fit(X_train, y_train)
-        
-        # Predict
-        preds = model.predict(X_test)
-        
-        # Metrics
-        rmse = np.sqrt(mean_squared_error(y_test, preds))
-        mae = mean_absolute_error(y_test, preds)
-        
-        # Information Coefficient (Rank Correlation) - important for finance
-        ic = pd.Series(preds).corr(pd.Series(y_test.values), method='spearman')
-        
-        print(f"Year {year} | RMSE: {rmse:.5f} | IC: {ic:.4f}")
-        
-        results.append({
-            "year": year,
-            "rmse": rmse,
-            "mae": mae,
-            "ic": ic
-        })
-        
-        all_predictions.extend(preds)
-        all_actuals.extend(y_test.values)
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+    
+    kernels = getattr(model_class, "numba_kernels", None)
+    if kernels is not None:
+        # Pure-NumPy models: one threaded call, no process or pickling overhead
+        outputs = _run_numba_splits(kernels, X_frame.to_numpy(), y_series.to_numpy(), bounds)
+    elif max_workers <= 1:
+        outputs = [_run_one_split(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_run_one_split, *task) for task in tasks]
+            outputs = [f.result() for f in as_completed(futures)]
+        # Completion order is arbitrary; report in year order
+        outputs.sort(key=lambda out: out[0]["year"])
+    
+    results = []
+    for metrics, _, _ in outputs:
+        print(f"Year {metrics['year']} | RMSE: {metrics['rmse']:.5f} | IC: {metrics['ic']:.4f}")
+        results.append(metrics)
+    
+    # Join the per-split arrays once instead of growing Python lists
+    all_predictions = np.concatenate([np.asarray(preds) for _, preds, _ in outputs])
+    all_actuals = np.concatenate([np.asarray(actuals) for _, _, actuals in outputs])
         
     overall_rmse = np.sqrt(mean_squared_error(all_actuals, all_predictions))
     print(f"\nOverall RMSE: {overall_rmse:.5f}")
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import List, Optional, Dict
+import numpy as np
 import pandas as pd
 
 @dataclass
@@ -26,13 +27,18 @@ class DatasetSpec:
         Validates if the dataframe conforms to the spec.
         """
         required_cols = [self.time_index_col, self.target_col] + self.feature_cols
-        missing = [c for c in required_cols if c not in df.columns]
+        present = set(df.columns)
+        missing = [c for c in required_cols if c not in present]
         
         if missing:
             raise ValueError(f"Dataset missing columns: {missing}")
             
-        # Check time monotonicity
-        if not df[self.time_index_col].is_monotonic_increasing:
+        # Check time monotonicity (an index caches this; a bare Index skips the Series wrap)
+        if df.index.name == self.time_index_col:
+            time_index = df.index
+        else:
+            time_index = pd.Index(df[self.time_index_col].to_numpy())
+        if not time_index.is_monotonic_increasing:
              raise ValueError(f"Time index {self.time_index_col} is not monotonic increasing.")
              
         return True
@@ -41,13 +47,20 @@ class DatasetSpec:
         """
         Returns (train, test) tuple based on the spec.
         """
-        # Ensure datetimelike
-        df[self.time_index_col] = pd.to_datetime(df[self.time_index_col])
+        # Ensure datetimelike (converted once; already-typed columns are left alone)
+        ts = df[self.time_index_col]
+        if not pd.api.types.is_datetime64_any_dtype(ts):
+            ts = pd.to_datetime(ts)
+            df[self.time_index_col] = ts
+        ts = pd.DatetimeIndex(ts)
         
-        train_mask = (df[self.time_index_col] >= self.train_start_date) & \
-                     (df[self.time_index_col] <= self.train_end_date)
-                     
-        test_mask = (df[self.time_index_col] >= self.test_start_date) & \
-                    (df[self.time_index_col] <= self.test_end_date)
-                    
-        return df[train_mask], df[test_mask]
+        # Date windows become slices of the time-sorted frame
+        if not ts.is_monotonic_increasing:
+            order = np.argsort(ts.values, kind='stable')
+            df, ts = df.iloc[order], ts[order]
+        
+        train = df.iloc[ts.searchsorted(pd.Timestamp(self.train_start_date), side='left'):
+                        ts.searchsorted(pd.Timestamp(self.train_end_date), side='right')]
+        test = df.iloc[ts.searchsorted(pd.Timestamp(self.test_start_date), side='left'):
+                       ts.searchsorted(pd.Timestamp(self.test_end_date), side='right')]
+        return train, test
@@ -1,7 +1,15 @@
 from dataclasses import dataclass
-from typing import Callable, Union
+from typing import Callable, Dict, Union
 import numpy as np
 
+# transformation name -> fn(series, params); looked up once per transform call
+_TRANSFORMS: Dict[str, Callable] = {
+    'raw': lambda series, params: series,
+    'pct_change': lambda series, params: series.pct_change(),
+    'log': lambda series, params: np.log(series),
+    'lag': lambda series, params: series.shift(params.get('lag', 1)),
+}
+
 @dataclass
 class FeatureSpec:
     """
@@ -16,17 +24,8 @@ class FeatureSpec:
         """
         Applies transformation.
         """
-        if self.transformation == 'raw':
-            return series
-            
-        if self.transformation == 'pct_change':
-            return series.pct_change()
-            
-        if self.transformation == 'log':
-            return np.log(series)
-            
-        if self.transformation == 'lag':
-            lag = self.params.get('lag', 1)
-            return series.shift(lag)
-            
-        raise ValueError(f"Unknown transformation: {self.transformation}")
+        try:
+            fn = _TRANSFORMS[self.transformation]
+        except KeyError:
+            raise ValueError(f"Unknown transformation: {self.transformation}")
+        return fn(series, self.params or {})
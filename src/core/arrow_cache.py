@@ -0,0 +1,56 @@
+import os
+import sys
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
+
+Reader = Callable[[str], pa.Table]
+
+# path -> (mtime, table); one parse per file per mtime for the whole process
+_tables: Dict[str, Tuple[float, pa.Table]] = {}
+_lock = threading.Lock()
+
+def read_table(path: str) -> pa.Table:
+    """Reads a Parquet or CSV file into an Arrow table."""
+    if path.endswith(".parquet"):
+        return pq.read_table(path)
+    return pacsv.read_csv(path)
+
+def get_table(path: str, reader: Optional[Reader] = None) -> pa.Table:
+    """
+    Returns the file as a shared pyarrow.Table, re-read only when its mtime changes.
+    Callers must treat the table as read-only; slice/take/filter return new
+    tables over the same buffers, so those can be converted with
+    to_pandas(split_blocks=True, self_destruct=True) without touching the cache.
+    """
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _tables.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    table = (reader or read_table)(path)
+    with _lock:
+        _tables[path] = (mtime, table)
+    return table
+
+def write_sidecar(path: str, sidecar: Optional[str] = None,
+                  reader: Optional[Reader] = None) -> str:
+    """
+    Persists a CSV as Parquet (default: same name, .parquet extension) so later
+    reads skip CSV parsing. Rewritten only when the source is newer.
+    """
+    sidecar = sidecar or os.path.splitext(path)[0] + ".parquet"
+    if not os.path.exists(sidecar) or os.path.getmtime(sidecar) < os.path.getmtime(path):
+        tmp = sidecar + ".tmp"
+        pq.write_table((reader or read_table)(path), tmp)
+        os.replace(tmp, sidecar)
+    return sidecar
+
+if __name__ == "__main__":
+    # Pre-convert CSVs after they are written: python src/core/arrow_cache.py <csv>...
+    for csv_path in sys.argv[1:]:
+        print(f"{csv_path} -> {write_sidecar(csv_path)}")
@@ -55,10 +55,12 @@ class Orchestrator:
                 self._execute_task(task, pipeline_name, force)
                 executed_tasks.add(task.name)
 
+        end_time = datetime.utcnow()
+        now = end_time.isoformat()
         self.state_store.set(f"last_pipeline_{pipeline_name}", {
-            "timestamp": datetime.utcnow().isoformat(),
-            "duration_sec": (datetime.utcnow() - start_time).total_seconds()
-        })
+            "timestamp": now,
+            "duration_sec": (end_time - start_time).total_seconds()
+        }, now=now)
         self.health_monitor.record_heartbeat()
         logger.info(f"Pipeline {pipeline_name} complete.")
 
@@ -1,11 +1,16 @@
 import os
-import json
+from collections import defaultdict
 from typing import Dict, List, Optional
-from datetime import datetime
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from pydantic import BaseModel, ConfigDict, Field
+
+from utils.fastjson import dumps, loads, JSONDecodeError
 
 class ModelMetadata(BaseModel):
     """Schema for model registry entries."""
+    # Immutable once built; model_* field names are ours, not pydantic's namespace
+    model_config = ConfigDict(frozen=True, extra='forbid', protected_namespaces=())
+    
     model_id: str = Field(..., description="Unique identifier (e.g., tcn_gold_v3)")
     version: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -19,26 +24,160 @@ class ModelMetadata(BaseModel):
     promoted_at: Optional[datetime] = None
     notes: Optional[str] = None
 
+def _epoch(iso: Optional[str]) -> Optional[float]:
+    """Epoch seconds for an ISO timestamp (naive values are UTC, as written by utcnow)."""
+    if not iso:
+        return None
+    ts = datetime.fromisoformat(str(iso))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
 class ModelRegistry:
     """
     Central registry for model governance.
+    self.models is the serialized view; lookups go through in-memory indices
+    (model_id -> entry, family -> model_ids, family -> champion entry) that
+    share the same dicts, so updates through either are visible to both.
+    
+    Persistence: registry.json is a snapshot and every mutation appends one
+    event to registry.log.jsonl next to it. Loading replays the log over the
+    snapshot; once the log reaches COMPACT_EVERY events it is folded back
+    into the snapshot.
     """
+    COMPACT_EVERY = 500
+    
     def __init__(self, registry_path: str = "models/registry.json"):
         self.registry_path = registry_path
+        self.log_path = os.path.splitext(registry_path)[0] + ".log.jsonl"
         os.makedirs(os.path.dirname(registry_path), exist_ok=True)
         self.models = self._load()
     
+    @staticmethod
+    def _family(model_id: str) -> str:
+        """Family name (e.g., tcn_gold from tcn_gold_v3)."""
+        return '_'.join(model_id.split('_')[:-1])
+    
     def _load(self) -> List[Dict]:
-        """Load registry from disk."""
-        if os.path.exists(self.registry_path):
-            with open(self.registry_path, 'r') as f:
-                return json.load(f)
-        return []
+        """Load the snapshot from disk and replay the event log over it."""
+        models = []
+        # A freshly created (empty) file is an empty registry
+        if os.path.exists(self.registry_path) and os.path.getsize(self.registry_path) > 0:
+            with open(self.registry_path, 'rb') as f:
+                models = loads(f.read())
+        self.models = models
+        self._rebuild_indices(models)
+        
+        self._log_events = 0
+        if os.path.exists(self.log_path):
+            good_end = 0 # byte offset just past the last complete event
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    try:
+                        event = loads(line)
+                    except JSONDecodeError:
+                        # Torn final line from an interrupted append
+                        break
+                    self._apply(event)
+                    self._log_events += 1
+                    good_end += len(line)
+                    complete = line.endswith(b"\n")
+            self._repair_log(good_end, good_end > 0 and not complete)
+        return models
+    
+    def _repair_log(self, good_end: int, missing_newline: bool):
+        """
+        Cuts a torn tail off the log so the next append starts on a fresh
+        line; otherwise it would be glued to the fragment and lost (with
+        every later event) at the next reload.
+        """
+        if good_end == os.path.getsize(self.log_path) and not missing_newline:
+            return
+        with open(self.log_path, 'r+b') as f:
+            f.truncate(good_end)
+            if missing_newline:
+                f.seek(good_end)
+                f.write(b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _rebuild_indices(self, models: List[Dict]):
+        """Builds the lookup indices with a single pass over the entries."""
+        self._by_id: Dict[str, Dict] = {}
+        self._by_family: Dict[str, List[str]] = defaultdict(list)
+        self._champion_by_family: Dict[str, Dict] = {}
+        
+        for m in models:
+            self._index(m)
+            
+    def _index(self, model: Dict):
+        # Numeric companions of the ISO timestamps, parsed once (back-filled for old entries)
+        if 'created_at_ts' not in model:
+            model['created_at_ts'] = _epoch(model.get('created_at'))
+        if 'promoted_at_ts' not in model:
+            model['promoted_at_ts'] = _epoch(model.get('promoted_at'))
+        
+        model_id = model['model_id']
+        family = self._family(model_id)
+        self._by_id[model_id] = model
+        self._by_family[family].append(model_id)
+        
+        if model['status'] == 'champion':
+            # Most recently promoted wins if the file holds several champions
+            current = self._champion_by_family.get(family)
+            if current is None or (model['promoted_at_ts'] or 0.0) > (current['promoted_at_ts'] or 0.0):
+                self._champion_by_family[family] = model
+    
+    def _apply(self, event: Dict):
+        """
+        Applies one mutation to the in-memory state. Used both live and when
+        replaying the log; re-applying an event already in the snapshot is a
+        no-op, so a crash between compaction's two steps is harmless.
+        """
+        op = event['op']
+        if op == 'register':
+            model = event['model']
+            if model['model_id'] not in self._by_id:
+                self.models.append(model)
+                self._index(model)
+        elif op == 'promote':
+            model = self._by_id[event['model_id']]
+            family = self._family(model['model_id'])
+            current_champion = self._champion_by_family.get(family)
+            if current_champion and current_champion is not model:
+                current_champion['status'] = 'retired'
+            model['status'] = 'champion'
+            model['promoted_at'] = event['promoted_at']
+            model['promoted_at_ts'] = _epoch(event['promoted_at'])
+            self._champion_by_family[family] = model
+        elif op == 'metrics':
+            self._by_id[event['model_id']]['metrics'].update(event['metrics'])
+        else:
+            raise ValueError(f"Unknown registry event: {op}")
     
-    def _save(self):
-        """Persist registry to disk."""
-        with open(self.registry_path, 'w') as f:
-            json.dump(self.models, f, indent=4, default=str)
+    def _append_event(self, event: Dict):
+        """Applies a mutation and persists it as one durable log line."""
+        self._apply(event)
+        with open(self.log_path, 'ab') as f:
+            f.write(dumps(event) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_events += 1
+        
+        if self._log_events >= self.COMPACT_EVERY:
+            self.compact()
+    
+    def compact(self):
+        """Rewrites the snapshot atomically, then truncates the event log."""
+        tmp = self.registry_path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(dumps(self.models, pretty=True))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.registry_path)
+        
+        open(self.log_path, 'w').close()
+        self._log_events = 0
     
     def register(self, metadata: ModelMetadata) -> str:
         """
@@ -50,57 +189,49 @@ class ModelRegistry:
         if existing:
             raise ValueError(f"Model {metadata.model_id} already exists. Use update() or create new version.")
         
-        self.models.append(metadata.dict())
-        self._save()
+        # JSON-mode dump (pydantic-core) so the live entry matches what a reload sees
+        model = metadata.model_dump(mode='json')
+        self._append_event({'op': 'register', 'model': model})
         return metadata.model_id
     
     def get_model(self, model_id: str) -> Optional[Dict]:
         """Retrieve model metadata by ID."""
-        for model in self.models:
-            if model['model_id'] == model_id:
-                return model
-        return None
+        return self._by_id.get(model_id)
     
     def get_champion(self, model_family: str = "tcn_gold") -> Optional[Dict]:
         """
         Get the current champion model for a family.
+        A prefix that is not itself a family (e.g. "tcn") returns the most
+        recently promoted champion among the families it covers.
         """
-        champions = [m for m in self.models 
-                    if m['model_id'].startswith(model_family) and m['status'] == 'champion']
+        champion = self._champion_by_family.get(model_family)
+        if champion is not None:
+            return champion
         
+        # Scans champions only (one per family), not every registered model
+        champions = [m for m in self._champion_by_family.values()
+                     if m['model_id'].startswith(model_family)]
         if not champions:
             return None
         
         # Return most recently promoted
-        champions.sort(key=lambda x: x.get('promoted_at', ''), reverse=True)
-        return champions[0]
+        return max(champions, key=lambda x: x['promoted_at_ts'] or 0.0)
     
-    def promote_to_champion(self, model_id: str):
+    def promote_to_champion(self, model_id: str, *, now: Optional[str] = None):
         """
         Promote a model to champion status.
         Automatically retires previous champion.
+        :param now: ISO promotion timestamp (defaults to the current UTC time).
         """
         model = self.get_model(model_id)
         if not model:
             raise ValueError(f"Model {model_id} not found")
         
-        # Extract family name (e.g., tcn_gold from tcn_gold_v3)
-        family = '_'.join(model_id.split('_')[:-1])
-        
-        # Retire current champion
-        current_champion = self.get_champion(family)
-        if current_champion:
-            for m in self.models:
-                if m['model_id'] == current_champion['model_id']:
-                    m['status'] = 'retired'
-        
-        # Promote new champion
-        for m in self.models:
-            if m['model_id'] == model_id:
-                m['status'] = 'champion'
-                m['promoted_at'] = datetime.utcnow().isoformat()
-        
-        self._save()
+        self._append_event({
+            'op': 'promote',
+            'model_id': model_id,
+            'promoted_at': now or datetime.utcnow().isoformat()
+        })
     
     def list_models(self, status: Optional[str] = None) -> List[Dict]:
         """List all models, optionally filtered by status."""
@@ -108,11 +239,13 @@ class ModelRegistry:
             return [m for m in self.models if m['status'] == status]
         return self.models
     
+    def list_family(self, model_family: str) -> List[Dict]:
+        """All models of a family, in registration order."""
+        return [self._by_id[model_id] for model_id in self._by_family.get(model_family, [])]
+    
     def update_metrics(self, model_id: str, new_metrics: Dict[str, float]):
         """Update metrics for a model (e.g., after live performance tracking)."""
-        for m in self.models:
-            if m['model_id'] == model_id:
-                m['metrics'].update(new_metrics)
-                self._save()
-                return
-        raise ValueError(f"Model {model_id} not found")
+        model = self.get_model(model_id)
+        if model is None:
+            raise ValueError(f"Model {model_id} not found")
+        self._append_event({'op': 'metrics', 'model_id': model_id, 'metrics': dict(new_metrics)})
@@ -1,11 +1,14 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, List, Optional
 import numpy as np
+import math
 
 class RiskProfile(BaseModel):
     """
     Immutable risk axioms for a trading mandate.
     """
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     max_drawdown: float = Field(..., description="Hard stop drawdown limit (e.g., 0.20 for 20%)")
     vol_target: float = Field(..., description="Annualized volatility target (e.g., 0.15 for 15%)")
     max_leverage: float = Field(default=1.0, description="Maximum gross exposure ratio")
@@ -15,6 +18,8 @@ class PortfolioState(BaseModel):
     """
     Current state of the portfolio for risk checking.
     """
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     current_equity: float
     peak_equity: float
     current_volatility: float
@@ -49,11 +54,21 @@ class CapitalConstitution:
         Clamps a requested position size to comply with max position limits and leverage.
         Returns the accepted size.
         """
+        # Plain float math: no 0-d array per call for single-symbol callers
+        max_allowed_val = state.current_equity * self.profile.position_limit_pct
+        return math.copysign(min(abs(size), max_allowed_val), size)
+
+    def validate_position_sizes(self, sizes: np.ndarray, state: PortfolioState) -> np.ndarray:
+        """
+        Batch form of validate_position_size: clamps a whole vector of
+        requested sizes (one per symbol) in a single vectorized pass.
+        """
         # 1. Check Single Position Limit
         max_allowed_val = state.current_equity * self.profile.position_limit_pct
-        clamped_size = min(abs(size), max_allowed_val) * np.sign(size)
+        sizes = np.asarray(sizes, dtype=float)
+        clamped_sizes = np.copysign(np.minimum(np.abs(sizes), max_allowed_val), sizes)
         
         # 2. Check Gross Leverage (simplified, assumes this is the incremental add)
         # Real logic would check (current_gross + new_size) <= max_leverage * equity
-        # For now, we return the clamped individual size.
-        return clamped_size
+        # For now, we return the clamped individual sizes.
+        return clamped_sizes
@@ -1,4 +1,3 @@
-import schedule
 import time
 import os
 import sys
@@ -13,6 +12,25 @@ from intelligence.news_correlator import NewsCorrelator
 
 logger = setup_logger("continuous_cycle", log_file="continuous_cycle.log")
 
+# Pipeline components, built on first use and reused by every cycle
+_FETCHER = None
+_DETECTOR = None
+_CORRELATOR = None
+
+def _get_components():
+    """
+    Returns the shared (fetcher, detector, correlator), built once per process
+    rather than on every tick.
+    """
+    global _FETCHER, _DETECTOR, _CORRELATOR
+    if _FETCHER is None:
+        _FETCHER = BSEHistoricalFetcher()
+    if _DETECTOR is None:
+        _DETECTOR = SpikeDetector()
+    if _CORRELATOR is None:
+        _CORRELATOR = NewsCorrelator()
+    return _FETCHER, _DETECTOR, _CORRELATOR
+
 def run_analysis_cycle():
     """
     Executes one full cycle of the intelligence pipeline.
@@ -25,7 +43,7 @@ def run_analysis_cycle():
     
     # 1. Fetch Latest Data
     try:
-        fetcher = BSEHistoricalFetcher()
+        fetcher, detector, correlator = _get_components()
         new_data = fetcher.fetch_latest()
         if new_data.empty:
             logger.info("No new data found for today yet.")
@@ -33,14 +51,12 @@ def run_analysis_cycle():
             logger.info(f"Ingested {len(new_data)} new records.")
             
             # 2. Detect Anomalies on New Data
-            detector = SpikeDetector()
             spikes = detector.detect_spikes(new_data)
             
             if not spikes.empty:
                 logger.info(f"DETECTED {len(spikes)} REAL-TIME ANOMALIES!")
                 
                 # 3. Correlate with News
-                correlator = NewsCorrelator()
                 context_spikes = correlator.correlate_spikes(spikes)
                 
                 # Append to persistent record
@@ -63,15 +79,23 @@ def start_continuous_loop(interval_minutes=60):
     """
     logger.info(f"Starting Continuous Intelligence Engine (Interval: {interval_minutes} mins)")
     
+    # Warm the shared components so the first tick does no setup
+    _get_components()
+    
     # Run once immediately
+    interval = interval_minutes * 60
+    next_run = time.monotonic() + interval
     run_analysis_cycle()
     
-    # Schedule
-    schedule.every(interval_minutes).minutes.do(run_analysis_cycle)
-    
+    # Sleep straight through to each deadline instead of polling a scheduler
     while True:
-        schedule.run_pending()
-        time.sleep(1)
+        time.sleep(max(0.0, next_run - time.monotonic()))
+        run_analysis_cycle()
+        next_run += interval
+        # A cycle that overran skips the missed slots rather than running back to back
+        now = time.monotonic()
+        if next_run <= now:
+            next_run += interval * ((now - next_run) // interval + 1)
 
 if __name__ == "__main__":
     # For demonstration/testing, we might run just once or start the loop
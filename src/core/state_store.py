@@ -1,7 +1,8 @@
-import json
 import os
+import threading
 from typing import Any, Dict, Optional
 from datetime import datetime
+from utils.fastjson import dumps, loads, JSONDecodeError
 
 class StateStore:
     """
@@ -9,37 +10,58 @@ class StateStore:
     """
     def __init__(self, state_file_path: str):
         self.path = state_file_path
+        self._lock = threading.Lock()
         self._state = self._load()
 
     def _load(self) -> Dict[str, Any]:
         if os.path.exists(self.path):
             try:
-                with open(self.path, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
+                with open(self.path, 'rb') as f:
+                    return loads(f.read())
+            except (JSONDecodeError, IOError):
                 return {}
         return {}
 
     def save(self):
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        with open(self.path, 'w') as f:
-            json.dump(self._state, f, indent=4)
+        # Write to a sibling temp file and swap it in so readers never see a torn file
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(self._state))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
 
-    def set(self, key: str, value: Any):
-        self._state[key] = value
-        self._state["last_updated"] = datetime.utcnow().isoformat()
-        self.save()
+    def set(self, key: str, value: Any, *, now: Optional[str] = None):
+        self.update({key: value}, now=now)
+
+    def update(self, values: Dict[str, Any], *, now: Optional[str] = None):
+        """
+        Merges several keys and persists them with a single write.
+        Skips the write (and the last_updated bump) when nothing changes.
+        :param now: ISO timestamp to record; bulk callers format it once and
+            pass it to every call instead of re-reading the clock.
+        """
+        with self._lock:
+            if all(key in self._state and self._state[key] == value
+                   for key, value in values.items()):
+                return
+            self._state.update(values)
+            self._state["last_updated"] = now or datetime.utcnow().isoformat()
+            self.save()
 
     def get(self, key: str, default: Any = None) -> Any:
         return self._state.get(key, default)
 
-    def update_checkpoint(self, job_name: str, status: str, marker: Optional[str] = None):
+    def update_checkpoint(self, job_name: str, status: str, marker: Optional[str] = None,
+                          *, now: Optional[str] = None):
+        now = now or datetime.utcnow().isoformat()
         checkpoint = {
             "status": status,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now,
             "marker": marker
         }
-        self.set(f"checkpoint_{job_name}", checkpoint)
+        self.set(f"checkpoint_{job_name}", checkpoint, now=now)
 
     def get_all(self) -> Dict[str, Any]:
         return self._state
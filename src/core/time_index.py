@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Union
+from typing import Optional, Union
 
 def causal_slice(df: pd.DataFrame, t: Union[datetime, str, pd.Timestamp]) -> pd.DataFrame:
     """
@@ -8,6 +9,9 @@ def causal_slice(df: pd.DataFrame, t: Union[datetime, str, pd.Timestamp]) -> pd.
     Ensures that no future data is available to a model or processor at time t.
     """
     ts = pd.to_datetime(t)
+    if df.index.is_monotonic_increasing:
+        # Binary search on the sorted index: O(log N) and a view, no N-row mask
+        return df.iloc[:df.index.searchsorted(ts, side='right')]
     return df[df.index <= ts]
 
 def apply_causal_mask(df: pd.DataFrame, shift_count: int = 1) -> pd.DataFrame:
@@ -17,6 +21,39 @@ def apply_causal_mask(df: pd.DataFrame, shift_count: int = 1) -> pd.DataFrame:
     """
     return df.shift(shift_count)
 
+class CausalFrame:
+    """
+    Lag-aware point-in-time reads over a frame without materializing shifted
+    copies: row(t) equals apply_causal_mask(df, shift_count) at the last
+    timestamp <= t. The values are extracted once (sorted by time) and every
+    read is a binary search plus a NumPy view, so a per-bar loop does no
+    per-bar frame allocation.
+    """
+    def __init__(self, df: pd.DataFrame, shift_count: int = 1):
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind='stable')
+        self._arr = df.to_numpy()
+        self._index = df.index
+        self._shift = shift_count
+        self.columns = df.columns
+
+    def _end(self, t) -> int:
+        """Number of rows visible at t after the causal shift."""
+        return self._index.searchsorted(pd.to_datetime(t), side='right') - self._shift
+
+    def __getitem__(self, t) -> np.ndarray:
+        """Feature row usable at time t (all NaN before enough history exists)."""
+        pos = self._end(t) - 1
+        if pos < 0:
+            return np.full(self._arr.shape[1], np.nan)
+        return self._arr[pos]
+
+    def window(self, t, n: Optional[int] = None) -> np.ndarray:
+        """The last n usable rows at time t (all of them if n is None), as a view."""
+        end = max(self._end(t), 0)
+        start = 0 if n is None else max(end - n, 0)
+        return self._arr[start:end]
+
 def get_asof_view(df: pd.DataFrame, asof_time: datetime) -> pd.DataFrame:
     """
     Simulates a 'Point-in-Time' view of a dataset.
@@ -0,0 +1,106 @@
+import asyncio
+import importlib.util
+import httpx
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.fastjson import loads
+from utils.logger import setup_logger
+
+logger = setup_logger("async_yf", log_file="market_data.log")
+
+# HTTP/2 multiplexing needs the optional h2 package; HTTP/1.1 keep-alive otherwise
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{}"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+MAX_CONCURRENCY = 16 # requests in flight; Yahoo throttles well before hundreds
+
+def _chart_params(start=None, end=None, period=None, interval="1d"):
+    """yf.download-style arguments -> chart query parameters (end is exclusive)."""
+    params = {"interval": interval, "includePrePost": "false", "events": "div,splits"}
+    if start is not None:
+        params["period1"] = int(pd.Timestamp(start, tz="UTC").timestamp())
+        end = pd.Timestamp(end, tz="UTC") if end is not None else pd.Timestamp.now(tz="UTC")
+        params["period2"] = int(end.timestamp())
+    else:
+        params["range"] = period or "1mo"
+    return params
+
+def _chart_frame(content, interval):
+    """
+    Parses one chart response into an OHLCV frame, auto-adjusted like
+    yf.download (prices scaled by adjclose / close). Daily bars are indexed by
+    exchange-local date, intraday bars by UTC time. None if there are no bars.
+    """
+    result = (loads(content).get("chart", {}).get("result") or [None])[0]
+    if not result or not result.get("timestamp"):
+        return None
+
+    quote = result["indicators"]["quote"][0]
+    df = pd.DataFrame({
+        'Open': quote.get("open"), 'High': quote.get("high"), 'Low': quote.get("low"),
+        'Close': quote.get("close"), 'Volume': quote.get("volume")
+    }, dtype='float64')
+
+    adjclose = result["indicators"].get("adjclose")
+    if adjclose:
+        adjusted = np.asarray(adjclose[0]["adjclose"], dtype='float64')
+        ratio = adjusted / df['Close'].to_numpy()
+        df[['Open', 'High', 'Low']] = df[['Open', 'High', 'Low']].mul(ratio, axis=0)
+        df['Close'] = adjusted
+
+    index = pd.to_datetime(result["timestamp"], unit='s', utc=True)
+    if interval.endswith(("d", "wk", "mo")):
+        tz = result.get("meta", {}).get("exchangeTimezoneName", "UTC")
+        index = index.tz_convert(tz).normalize().tz_localize(None)
+    df.index = index.rename('Date' if index.tz is None else 'Datetime')
+    return df[~df.index.duplicated(keep='last')]
+
+async def fetch_one(client, semaphore, ticker, params):
+    """One ticker's chart; the JSON -> frame work runs off the event loop. None on failure."""
+    try:
+        async with semaphore:
+            response = await client.get(CHART_URL.format(ticker), params=params)
+        if response.status_code != 200:
+            logger.warning(f"Chart request for {ticker} failed: HTTP {response.status_code}")
+            return None
+        return await asyncio.to_thread(_chart_frame, response.content, params["interval"])
+    except Exception as e:
+        logger.error(f"Error fetching chart for {ticker}: {e}")
+        return None
+
+async def fetch_all(tickers, start=None, end=None, period=None, interval="1d",
+                    max_concurrency=MAX_CONCURRENCY):
+    """Fetches every ticker over one pooled client. Returns {ticker: frame or None}."""
+    params = _chart_params(start, end, period, interval)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=10,
+        headers=HEADERS,
+        limits=httpx.Limits(max_connections=max_concurrency,
+                            max_keepalive_connections=max_concurrency)
+    ) as client:
+        frames = await asyncio.gather(*[
+            fetch_one(client, semaphore, ticker, params) for ticker in tickers
+        ])
+    return dict(zip(tickers, frames))
+
+def download(tickers, start=None, end=None, period=None, interval="1d"):
+    """
+    Blocking facade with yf.download(group_by='ticker')'s layout: one
+    (ticker, price) column pair per field, tickers in input order. None if no
+    ticker returned data.
+    """
+    frames = asyncio.run(fetch_all(list(tickers), start, end, period, interval))
+    frames = {ticker: df for ticker, df in frames.items() if df is not None}
+    if not frames:
+        return None
+    return pd.concat(frames, axis=1, names=['Ticker', 'Price']).sort_index()
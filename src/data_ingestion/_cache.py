@@ -0,0 +1,55 @@
+import os
+import json
+import time
+import hashlib
+import pandas as pd
+from pathlib import Path
+
+class YFCache:
+    """
+    TTL file cache for yfinance downloads: one Parquet file per request,
+    keyed by an MD5 of the tickers and download parameters. Repeated runs
+    within the TTL (dev loops, same-day cron runs) read the file instead of
+    going back to the network.
+    """
+
+    def __init__(self, cache_dir="data/cache/yf", ttl_sec=6 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = ttl_sec
+
+    @staticmethod
+    def key(tickers, **params):
+        """Order-independent in the tickers; params are e.g. start/end or period/interval."""
+        payload = json.dumps([sorted(tickers), sorted(params.items())], default=str)
+        return hashlib.md5(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.parquet"
+
+    def get(self, key):
+        """Cached frame if it is younger than the TTL, else None."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime < self.ttl_sec:
+                return pd.read_parquet(path)
+        except (OSError, ValueError): # missing, or a corrupt/partial file
+            pass
+        return None
+
+    def set(self, key, df):
+        path = self._path(key)
+        # Unique tmp name: chunks are written from several threads
+        tmp_path = f"{path}.{os.getpid()}.{id(df)}.tmp"
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached frame or calls compute(); empty results are not cached."""
+        df = self.get(key)
+        if df is not None:
+            return df
+        df = compute()
+        if df is not None and not df.empty:
+            self.set(key, df)
+        return df
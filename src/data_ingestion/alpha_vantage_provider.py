@@ -1,8 +1,12 @@
-import requests
+import asyncio
+import importlib.util
+import httpx
 import pandas as pd
 import os
 import sys
 import time
+import threading
+from collections import deque
 
 # Add src to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,15 +15,81 @@ from utils.logger import setup_logger
 
 logger = setup_logger("alpha_vantage", log_file="news_ingestion.log")
 
+# HTTP/2 multiplexing needs the optional h2 package; HTTP/1.1 keep-alive otherwise
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Alpha Vantage feed keys -> our news columns (in output order)
+_FEED_COLUMNS = {
+    "title": "headline",
+    "source": "source",
+    "time_published": "timestamp_utc",
+    "overall_sentiment_score": "relevance_score",
+    "summary": "summary",
+    "url": "url"
+}
+
+def _feed_frame(feed, sector=None):
+    """
+    Builds the news DataFrame straight from the feed records: pandas projects
+    the wanted keys (missing ones become NaN) and timestamps and scores are
+    parsed once, column-wise.
+    """
+    df = pd.DataFrame(feed, columns=list(_FEED_COLUMNS)).rename(columns=_FEED_COLUMNS)
+    df["timestamp_utc"] = pd.to_datetime(df["timestamp_utc"], format="%Y%m%dT%H%M%S",
+                                         errors="coerce")
+    df["relevance_score"] = pd.to_numeric(df["relevance_score"], errors="coerce").astype("float32")
+    if sector is not None:
+        df["sector"] = sector
+    return df
+
+class _RateLimiter:
+    """
+    Sliding-window limiter: at most `rpm` acquisitions in any 60s window.
+    Shared across event loops and threads; callers wait asynchronously
+    until a slot frees up.
+    """
+    def __init__(self, rpm, window=60.0):
+        self.rpm = rpm
+        self.window = window
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.window:
+                    self._calls.popleft()
+                if len(self._calls) < self.rpm:
+                    self._calls.append(now)
+                    return
+                wait = self.window - (now - self._calls[0])
+            await asyncio.sleep(wait)
+
 class AlphaVantageNewsProvider(NewsProvider):
     """
     Fetches real-time news sentiment from Alpha Vantage.
     Optimized for large universes with sector-based batching.
     """
-    def __init__(self, api_key):
+    def __init__(self, api_key, tier_rpm=5):
+        """
+        :param tier_rpm: requests per minute allowed by the plan
+            (free tier: 5, premium plans: 75 and up).
+        """
         self.api_key = api_key
         self.base_url = "https://www.alphavantage.co/query"
-        self.rate_limit_delay = 12  # Free tier: 5 calls/min = 12s between calls
+        self.tier_rpm = tier_rpm
+        self.rate_limit_delay = 60.0 / tier_rpm  # Free tier: 5 calls/min = 12s between calls
+        self._limiter = _RateLimiter(tier_rpm)
+
+    def _make_client(self):
+        # HTTP/2 when h2 is installed: concurrent sector requests share one connection
+        return httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=30)
+
+    async def _get(self, params):
+        async with self._make_client() as client:
+            await self._limiter.acquire()
+            return await client.get(self.base_url, params=params)
 
     def fetch_news(self, start_date=None, end_date=None, tickers=None, time_from=None):
         """
@@ -45,9 +115,9 @@ class AlphaVantageNewsProvider(NewsProvider):
         logger.info(f"Requesting Alpha Vantage News for {params.get('tickers', params.get('topics'))}...")
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
+            response = asyncio.run(self._get(params))
             response.raise_for_status()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching news from Alpha Vantage: {e}")
             return pd.DataFrame()
             
@@ -66,74 +136,70 @@ class AlphaVantageNewsProvider(NewsProvider):
             logger.debug(f"No news feed found in response. Possible zero results or rate limit.")
             return pd.DataFrame()
             
-        news_items = []
-        for item in data["feed"]:
-            news_items.append({
-                "headline": item.get("title"),
-                "source": item.get("source"),
-                "timestamp_utc": item.get("time_published"),
-                "relevance_score": item.get("overall_sentiment_score"),
-                "summary": item.get("summary"),
-                "url": item.get("url")
-            })
-            
-        logger.info(f"Successfully fetched {len(news_items)} news items.")
-        return pd.DataFrame(news_items)
+        news_df = _feed_frame(data["feed"])
+        logger.info(f"Successfully fetched {len(news_df)} news items.")
+        return news_df
 
     def fetch_news_by_sectors(self, sectors, time_from=None):
         """
-        Fetch news for multiple sectors with rate limiting.
+        Fetch news for multiple sectors concurrently, within the plan's rate limit.
         sectors: List of sector names (e.g., ['technology', 'finance', 'energy'])
         """
-        all_news = []
+        if not sectors:
+            return pd.DataFrame()
         
-        for i, sector in enumerate(sectors):
-            logger.info(f"Fetching news for sector: {sector} ({i+1}/{len(sectors)})")
-            
-            params = {
-                "function": "NEWS_SENTIMENT",
-                "apikey": self.api_key,
-                "topics": sector,
-                "sort": "LATEST",
-                "limit": 200
-            }
+        batches = asyncio.run(self._fetch_sectors_async(sectors, time_from))
+        
+        # Results come back in sector order
+        batches = [batch for batch in batches if batch is not None]
+        all_news = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
+        logger.info(f"Total news items fetched: {len(all_news)}")
+        return all_news
+
+    async def _fetch_sectors_async(self, sectors, time_from=None):
+        # ~10s worth of the rate budget in flight at once (one request on the free tier)
+        semaphore = asyncio.Semaphore(max(1, min(self.tier_rpm // 6, len(sectors))))
+        async with self._make_client() as client:
+            return await asyncio.gather(*[
+                self._fetch_sector(client, semaphore, i, sector, len(sectors), time_from)
+                for i, sector in enumerate(sectors)
+            ])
+
+    async def _fetch_sector(self, client, semaphore, i, sector, n_sectors, time_from=None):
+        """One sector's NEWS_SENTIMENT request; returns its news DataFrame or None."""
+        logger.info(f"Fetching news for sector: {sector} ({i+1}/{n_sectors})")
+        
+        params = {
+            "function": "NEWS_SENTIMENT",
+            "apikey": self.api_key,
+            "topics": sector,
+            "sort": "LATEST",
+            "limit": 200
+        }
+        
+        if time_from:
+            params["time_from"] = time_from
+        
+        try:
+            async with semaphore:
+                # Rate limiting
+                await self._limiter.acquire()
+                response = await client.get(self.base_url, params=params)
+            response.raise_for_status()
+            data = response.json()
             
-            if time_from:
-                params["time_from"] = time_from
+            if "Note" in data or "ErrorMessage" in data:
+                logger.warning(f"API limit or error for {sector}: {data.get('Note', data.get('ErrorMessage'))}")
+                return None
             
-            try:
-                response = requests.get(self.base_url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
+            if "feed" in data:
+                logger.info(f"Fetched {len(data['feed'])} items for {sector}")
+                return _feed_frame(data["feed"], sector)
                 
-                if "Note" in data or "ErrorMessage" in data:
-                    logger.warning(f"API limit or error for {sector}: {data.get('Note', data.get('ErrorMessage'))}")
-                    continue
-                
-                if "feed" in data:
-                    for item in data["feed"]:
-                        all_news.append({
-                            "headline": item.get("title"),
-                            "source": item.get("source"),
-                            "timestamp_utc": item.get("time_published"),
-                            "relevance_score": item.get("overall_sentiment_score"),
-                            "summary": item.get("summary"),
-                            "url": item.get("url"),
-                            "sector": sector
-                        })
-                    logger.info(f"Fetched {len(data['feed'])} items for {sector}")
-                
-                # Rate limiting
-                if i < len(sectors) - 1:
-                    logger.debug(f"Rate limit delay: {self.rate_limit_delay}s")
-                    time.sleep(self.rate_limit_delay)
-                    
-            except Exception as e:
-                logger.error(f"Error fetching news for {sector}: {e}")
-                continue
+        except Exception as e:
+            logger.error(f"Error fetching news for {sector}: {e}")
         
-        logger.info(f"Total news items fetched: {len(all_news)}")
-        return pd.DataFrame(all_news)
+        return None
 
 if __name__ == "__main__":
     from dotenv import load_dotenv
@@ -1,11 +1,12 @@
-import requests
+import asyncio
+import importlib.util
+import httpx
 import pandas as pd
 import os
 import sys
 import argparse
 import time
 from datetime import datetime, timedelta
-import io
 
 # Add src to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,6 +14,9 @@ from utils.logger import setup_logger
 
 logger = setup_logger("bse_fetcher", log_file="bse_fetcher.log")
 
+# HTTP/2 multiplexing needs the optional h2 package; HTTP/1.1 keep-alive otherwise
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 class BSEHistoricalFetcher:
     """
     Fetches historical equity data from BSE's daily Bhavcopy archives.
@@ -21,91 +25,192 @@ class BSEHistoricalFetcher:
     
     BASE_URL = "https://www.bseindia.com/download/BhavCopy/Equity/BhavCopy_BSE_CM_0_0_0_{}_F_0000.CSV"
     
-    def __init__(self, output_dir="data/raw"):
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    # Standardize columns
+    # BSE 2024 Format: TckrSymb, FinInstrmNm, OpnPric, HghPric, LwPric, ClsPric, TtlTradgVol
+    COL_MAP = {
+        'TckrSymb': 'SC_CODE', # Using Symbol as Code for this format, or keep as is
+        'FinInstrmNm': 'SC_NAME',
+        'OpnPric': 'OPEN',
+        'HghPric': 'HIGH',
+        'LwPric': 'LOW', 
+        'ClsPric': 'CLOSE',
+        'TtlTradgVol': 'NO_OF_SHRS'
+    }
+    REQUIRED_COLS = ['SC_CODE', 'SC_NAME', 'OPEN', 'HIGH', 'LOW', 'CLOSE', 'NO_OF_SHRS', 'DATE']
+    # Parsed columns in either format (everything else is skipped by the parser)
+    # and their dtypes: float64 prices keep paisa precision for high-priced
+    # scrips, nullable Int64 volumes tolerate a blank cell without losing the day
+    USECOLS = frozenset(COL_MAP) | frozenset(COL_MAP.values())
+    DTYPES = {
+        **{col: 'float64' for col in ('OpnPric', 'HghPric', 'LwPric', 'ClsPric',
+                                      'OPEN', 'HIGH', 'LOW', 'CLOSE')},
+        'TtlTradgVol': 'Int64',
+        'NO_OF_SHRS': 'Int64'
+    }
+    MAX_RETRIES = 3
+    BACKOFF_SECONDS = 2.0 # Doubled per retry on 429/503
+    
+    def __init__(self, output_dir="data/raw", max_workers=12, holidays=None):
+        """
+        :param holidays: optional exchange holidays (dates or YYYY-MM-DD strings),
+            e.g. from BSE's published calendar. Holidays discovered through a
+            404 are remembered in the cache and excluded as well.
+        """
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
-        self.output_file = os.path.join(self.output_dir, "bse_history_raw.csv")
+        # Canonical history: one Parquet partition per trading day (date=YYYY-MM-DD/part.parquet)
+        self.output_path = os.path.join(self.output_dir, "bhav.parquet")
+        self.max_workers = max_workers
+        self.holidays = set(pd.to_datetime(list(holidays or [])).normalize())
+        
+        # Raw per-day files ({yyyymmdd}.csv) and holiday markers ({yyyymmdd}.404)
+        self.cache_dir = os.path.join(self.output_dir, "bhav")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Downloads hold off until this monotonic time after BSE throttles us
+        self._resume_at = 0.0
 
     def fetch_data(self, start_date, end_date):
         """
-        Iterates through the date range and downloads daily Bhavcopy files.
+        Downloads the daily Bhavcopy files for every trading day in the range
+        concurrently; unknown holidays simply return 404 (and are remembered).
+        Blocking facade over _fetch_data_async for synchronous callers.
         """
         start = datetime.strptime(start_date, "%Y-%m-%d")
         end = datetime.strptime(end_date, "%Y-%m-%d")
-        delta = timedelta(days=1)
         
-        all_data = []
+        # Trading-day calendar built once: weekdays minus known holidays
+        days = [d.to_pydatetime() for d in pd.bdate_range(start, end, freq='C',
+                                                          holidays=self._known_holidays())]
+        
+        all_data = [df for df in asyncio.run(self._fetch_data_async(days)) if df is not None]
+            
+        if all_data:
+            # gather() keeps the input order, so the frames are already in date order
+            final_df = pd.concat(all_data, ignore_index=True)
+            self._save_data(final_df)
+            return final_df
+        else:
+            logger.warning("No data fetched for the given range.")
+            return pd.DataFrame()
+
+    def _known_holidays(self):
+        """Configured holidays plus every {yyyymmdd}.404 marker, from one directory listing."""
+        marked = [name[:-4] for name in os.listdir(self.cache_dir) if name.endswith(".404")]
+        return sorted(self.holidays | set(pd.to_datetime(marked, format="%Y%m%d")))
+
+    def _make_client(self):
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=10,
+            headers=self.HEADERS,
+            limits=httpx.Limits(max_connections=self.max_workers,
+                                max_keepalive_connections=self.max_workers)
+        )
+
+    async def _fetch_data_async(self, days):
+        """Fetches every day over one pooled client, at most max_workers downloads in flight."""
+        semaphore = asyncio.Semaphore(self.max_workers)
+        async with self._make_client() as client:
+            return await asyncio.gather(*[
+                self._fetch_one(client, semaphore, day) for day in days
+            ])
+
+    async def _wait_if_throttled(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _throttle(self, seconds):
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def _fetch_one(self, client, semaphore, current_date):
+        """
+        Loads one day's Bhavcopy from the on-disk cache, downloading it first
+        if needed, and standardizes it. Returns None when the day has no
+        usable file (holiday, error or unexpected format).
+        """
+        date_str = current_date.strftime("%Y%m%d")
+        cache_path = os.path.join(self.cache_dir, f"{date_str}.csv")
+        holiday_path = os.path.join(self.cache_dir, f"{date_str}.404")
         
-        current_date = start
-        while current_date <= end:
-            # Skip weekends
-            if current_date.weekday() >= 5: # 5=Sat, 6=Sun
-                current_date += delta
-                continue
+        try:
+            if not (os.path.exists(cache_path) and os.path.getsize(cache_path) > 0):
+                async with semaphore:
+                    if not await self._download(client, current_date, cache_path, holiday_path):
+                        return None
+            
+            # Parsing is CPU work; keep it off the event loop so downloads overlap it
+            return await asyncio.to_thread(self._read_day, cache_path, current_date)
                 
-            date_str = current_date.strftime("%Y%m%d")
-            url = self.BASE_URL.format(date_str)
+        except Exception as e:
+            logger.error(f"Error fetching {date_str}: {e}")
+        
+        return None
+
+    def _read_day(self, cache_path, current_date):
+        """Parses and standardizes one cached Bhavcopy file (None if unrecognized)."""
+        date_str = current_date.strftime("%Y%m%d")
+        df = pd.read_csv(cache_path, usecols=self.USECOLS.__contains__, dtype=self.DTYPES,
+                         engine='c')
+        
+        # Check if new format exists
+        if 'ClsPric' in df.columns:
+            df = df.rename(columns=self.COL_MAP)
             
-            logger.info(f"Fetching BSE data for {current_date.strftime('%Y-%m-%d')}...")
+        # Handle Legacy Format if needed (SC_CODE, CLOSE)
+        if 'SC_CODE' in df.columns and 'CLOSE' in df.columns:
+            # Add Date column
+            df['DATE'] = current_date.strftime("%Y-%m-%d")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            # Filter only necessary columns
+            df = df[self.REQUIRED_COLS]
             
-            try:
-                response = requests.get(url, headers=headers, timeout=10)
+            logger.info(f"Loaded {len(df)} records for {date_str}.")
+            return df
+        else:
+            logger.warning(f"Unexpected columns for {date_str}: {df.columns}")
+            return None
+
+    async def _download(self, client, current_date, cache_path, holiday_path):
+        """
+        Downloads one day's file into the cache. Returns True when the file
+        is now cached; a 404 for a past date is remembered as a holiday.
+        """
+        date_str = current_date.strftime("%Y%m%d")
+        url = self.BASE_URL.format(date_str)
+        
+        logger.info(f"Fetching BSE data for {current_date.strftime('%Y-%m-%d')}...")
+        
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self._wait_if_throttled()
+            # Streamed: the body goes straight to disk, never held as one str
+            async with client.stream("GET", url) as response:
+                if response.status_code in (429, 503) and attempt < self.MAX_RETRIES:
+                    # Rate-limited: pause every download, then retry
+                    self._throttle(self.BACKOFF_SECONDS * 2 ** attempt)
+                    continue
                 
                 if response.status_code == 200:
-                    df = pd.read_csv(io.StringIO(response.text))
-                    
-                    # Standardize columns
-                    # BSE 2024 Format: TckrSymb, FinInstrmNm, OpnPric, HghPric, LwPric, ClsPric, TtlTradgVol
-                    col_map = {
-                        'TckrSymb': 'SC_CODE', # Using Symbol as Code for this format, or keep as is
-                        'FinInstrmNm': 'SC_NAME',
-                        'OpnPric': 'OPEN',
-                        'HghPric': 'HIGH',
-                        'LwPric': 'LOW', 
-                        'ClsPric': 'CLOSE',
-                        'TtlTradgVol': 'NO_OF_SHRS'
-                    }
-                    
-                    # Check if new format exists
-                    if 'ClsPric' in df.columns:
-                        df = df.rename(columns=col_map)
-                        
-                    # Handle Legacy Format if needed (SC_CODE, CLOSE)
-                    if 'SC_CODE' in df.columns and 'CLOSE' in df.columns:
-                        # Add Date column
-                        df['DATE'] = current_date.strftime("%Y-%m-%d")
-                        
-                        # Filter only necessary columns
-                        required_cols = ['SC_CODE', 'SC_NAME', 'OPEN', 'HIGH', 'LOW', 'CLOSE', 'NO_OF_SHRS', 'DATE']
-                        df = df[required_cols]
-                        
-                        all_data.append(df)
-                        logger.info(f"Successfully fetched {len(df)} records.")
-                    else:
-                        logger.warning(f"Unexpected columns for {date_str}: {df.columns}")
-                        
+                    # Write-then-rename so a partial download is never taken as cached
+                    tmp_path = cache_path + ".tmp"
+                    with open(tmp_path, 'wb') as f:
+                        # aiter_bytes undoes gzip/deflate transfer encoding
+                        async for chunk in response.aiter_bytes(1 << 20):
+                            f.write(chunk)
+                    os.replace(tmp_path, cache_path)
+                    return True
                 elif response.status_code == 404:
                     logger.info(f"Data not found for {date_str} (Likely Market Holiday).")
+                    # Today's file may simply not be published yet, so only past dates are remembered
+                    if current_date.date() < datetime.now().date():
+                        open(holiday_path, 'w').close()
                 else:
                     logger.warning(f"Failed to fetch {date_str}: HTTP {response.status_code}")
-                    
-            except Exception as e:
-                logger.error(f"Error fetching {date_str}: {e}")
-            
-            current_date += delta
-            time.sleep(0.5) # Polite delay
-            
-        if all_data:
-            final_df = pd.concat(all_data, ignore_index=True)
-            self._save_data(final_df)
-            return final_df
-        else:
-            logger.warning("No data fetched for the given range.")
-            return pd.DataFrame()
+                return False
 
     def fetch_latest(self):
         """Fetches data for the current date (and previous few days to be safe)."""
@@ -116,22 +221,20 @@ class BSEHistoricalFetcher:
         return self.fetch_data(start_date, end_date)
 
     def _save_data(self, new_df):
-        """Saves data to CSV, appending if exists."""
-        if os.path.exists(self.output_file):
-            # Read existing to avoid duplicates if needed, or just append
-            # For simplicity in this 'raw' cull, we'll overwrite or append carefully.
-            # Let's just overwrite properly for this cull session or append?
-            # User asked to "cull relevant historical data". 
-            # Safest is to append new dates, but loading entire history to dedup is heavy.
-            # We'll validly check last date if we were doing incremental, but here we just save what we fetched.
-            
-            # Use append mode with header check
-            header = False
-            new_df.to_csv(self.output_file, mode='a', header=header, index=False)
-            logger.info(f"Appended {len(new_df)} records to {self.output_file}")
-        else:
-            new_df.to_csv(self.output_file, index=False)
-            logger.info(f"Saved {len(new_df)} records to {self.output_file}")
+        """
+        Writes each day's rows to its own zstd Parquet partition. Re-fetched
+        days replace their partition, so overlapping windows never duplicate rows.
+        """
+        # Codes are numeric in legacy files and symbols in the 2024 format; keep one schema
+        new_df = new_df.astype({'SC_CODE': str, 'SC_NAME': str})
+        for date, day_df in new_df.groupby('DATE', sort=False):
+            part_dir = os.path.join(self.output_path, f"date={date}")
+            os.makedirs(part_dir, exist_ok=True)
+            part_path = os.path.join(part_dir, "part.parquet")
+            tmp_path = part_path + ".tmp"
+            day_df.to_parquet(tmp_path, compression='zstd', index=False)
+            os.replace(tmp_path, part_path)
+        logger.info(f"Saved {len(new_df)} records to {self.output_path}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Fetch BSE Historical Data')
@@ -1,23 +1,135 @@
-import yfinance as yf
 import pandas as pd
+import pyarrow.parquet as pq
 import os
 import sys
-import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add src to path if needed for local execution
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import COMMODITIES, MACRO_DRIVERS, RAW_DATA_DIR, START_DATE, ASSET_UNIVERSE
+from data_ingestion._cache import YFCache
+from data_ingestion import _async_yf
+
+# Seconds a cached download is reused: daily bars settle, intraday bars move
+DAILY_CACHE_TTL = 6 * 3600
+INTRADAY_CACHE_TTL = 5 * 60
 
 def chunk_list(lst, n):
     """Yield successive n-sized chunks from lst."""
     for i in range(0, len(lst), n):
         yield lst[i:i + n]
 
-def fetch_yfinance_data(tickers, start_date, output_filename, chunk_size=50):
+def _download_chunks(ticker_list, chunk_size, max_workers, label="chunk",
+                     cache_ttl=DAILY_CACHE_TTL, backend="yfinance", **download_kwargs):
+    """
+    Downloads ticker chunks concurrently (yf.download keeps per-call state, so
+    parallel calls are safe). Returns the non-empty frames in chunk order.
+    Each chunk is served from the YFCache while younger than cache_ttl seconds.
+    
+    Parallelism is two-level: max_workers chunks in flight, and within each
+    chunk yf.download(threads=True) fetches its symbols on its own thread pool
+    (Yahoo's chart endpoint is one request per symbol). Keep chunk_size near
+    Yahoo's ~20 symbols per batch so max_workers * chunk_size requests in
+    flight stay under its throttling.
+    
+    backend="async" skips yfinance and its threads: every uncached symbol is
+    fetched from the chart endpoint on one event loop (see _async_yf).
+    """
+    # Response caching lives here rather than in the HTTP layer: yfinance refuses
+    # caching sessions (requests_cache) and already pools connections in the
+    # curl_cffi session its shared YfData client keeps across downloads
+    cache = YFCache(ttl_sec=cache_ttl)
+    chunks = list(chunk_list(ticker_list, chunk_size))
+    
+    if backend == "async":
+        return _download_chunks_async(chunks, cache, label, download_kwargs)
+    
+    import yfinance as yf # Deferred: heavy import only needed when actually downloading
+
+    def download(chunk):
+        return cache.get_or_compute(
+            YFCache.key(chunk, **download_kwargs),
+            lambda: yf.download(chunk, group_by='ticker', threads=True, progress=False,
+                                **download_kwargs)
+        )
+    
+    results = [None] * len(chunks)
+    
+    # Concurrency is bounded by max_workers instead of a fixed pause between chunks
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for i, chunk in enumerate(chunks):
+            print(f"Downloading {label}: {chunk[:3]}... ({len(chunk)} assets)")
+            futures[executor.submit(download, chunk)] = i
+        
+        for future in as_completed(futures):
+            i = futures[future]
+            chunk = chunks[i]
+            try:
+                chunk_data = future.result()
+                if chunk_data is not None and not chunk_data.empty:
+                    # If only one ticker in chunk, yfinance returns a single-level column DF
+                    if len(chunk) == 1:
+                        chunk_data.columns = pd.MultiIndex.from_product([chunk, chunk_data.columns]).swaplevel()
+                    results[i] = chunk_data
+            except Exception as e:
+                print(f"Failed to download {label} {chunk[:3]}: {e}")
+    
+    return [df for df in results if df is not None]
+
+def _download_chunks_async(chunks, cache, label, download_kwargs):
+    """Cached chunks come from the YFCache; all the other symbols are fetched in one asyncio run."""
+    keys = [YFCache.key(chunk, **download_kwargs) for chunk in chunks]
+    results = [cache.get(key) for key in keys]
+    missing = [ticker for chunk, df in zip(chunks, results) if df is None for ticker in chunk]
+    
+    if missing:
+        print(f"Downloading {label}s async: {len(missing)} assets")
+        fetched = _async_yf.download(missing, **download_kwargs)
+        got = set(fetched.columns.get_level_values(0)) if fetched is not None else set()
+        for i, chunk in enumerate(chunks):
+            present = [ticker for ticker in chunk if ticker in got]
+            if results[i] is None and present:
+                results[i] = fetched[present]
+                cache.set(keys[i], results[i])
+            elif results[i] is None:
+                print(f"Failed to download {label} {chunk[:3]}")
+    
+    return [df for df in results if df is not None and not df.empty]
+
+def _write_parquet(df, path):
+    """Write-then-rename so readers never see a half-written file."""
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, engine='pyarrow', compression='zstd')
+    os.replace(tmp_path, path)
+
+def _last_index_value(path):
+    """
+    Latest index value of a Parquet file written by _write_parquet, from the
+    row-group statistics in its footer; no column data is read.
+    """
+    parquet_file = pq.ParquetFile(path)
+    index_col = parquet_file.schema_arrow.pandas_metadata['index_columns'][0]
+    meta = parquet_file.metadata
+    # A RangeIndex is stored as metadata only (a dict), so there are no dates to find
+    if not isinstance(index_col, str) or meta.num_row_groups == 0:
+        return None
+    first = meta.row_group(0)
+    col = next(j for j in range(first.num_columns) if first.column(j).path_in_schema == index_col)
+    stats = [meta.row_group(r).column(col).statistics for r in range(meta.num_row_groups)]
+    if all(st is not None and st.has_min_max for st in stats):
+        return max(st.max for st in stats)
+    # No statistics: read just the index column
+    index = pq.read_table(path, columns=[index_col]).column(index_col).to_pandas()
+    return index.max() if len(index) else None
+
+def fetch_yfinance_data(tickers, start_date, output_filename, chunk_size=20, max_workers=4,
+                        cache_ttl=DAILY_CACHE_TTL, backend="yfinance"):
     """
     Fetches daily OHLCV data incrementally if file exists, otherwise full download.
     Optimized for batch downloading with chunking to avoid throttling.
+    Returns the full stored frame after an update, None when nothing new was fetched.
     """
     output_path = os.path.join(RAW_DATA_DIR, output_filename)
     today = datetime.datetime.now().strftime('%Y-%m-%d')
@@ -27,61 +139,55 @@ def fetch_yfinance_data(tickers, start_date, output_filename, chunk_size=50):
         print(f"No tickers found for {output_filename}, skipping.")
         return
     
-    print(f"Processing ingestion for {len(ticker_list)} assets into {output_filename} (Chunk Size: {chunk_size})...")
-    
-    all_data = []
-    
-    # Simple strategy: Full download always for now if the universe is large, 
-    # or implement robust merging. Given the requirement for scalability, 
-    # we'll use yf.download on chunks and combine.
-    
-    for chunk in chunk_list(ticker_list, chunk_size):
-        print(f"Downloading chunk: {chunk[:3]}... ({len(chunk)} assets)")
-        try:
-            chunk_data = yf.download(chunk, start=start_date, end=today, group_by='ticker', progress=False)
-            if not chunk_data.empty:
-                # If only one ticker in chunk, yfinance returns a single-level column DF
-                if len(chunk) == 1:
-                    chunk_data.columns = pd.MultiIndex.from_product([chunk, chunk_data.columns]).swaplevel()
-                all_data.append(chunk_data)
-            time.sleep(1) # Subtle delay to be polite
-        except Exception as e:
-            print(f"Failed to download chunk {chunk[:3]}: {e}")
+    # Incremental: only the days after the stored history are downloaded; the
+    # stored frame itself is read only once there is something to merge into it
+    has_history = False
+    if os.path.exists(output_path):
+        last_date = _last_index_value(output_path)
+        if last_date is not None and not pd.isna(last_date):
+            has_history = True
+            start_date = (pd.Timestamp(last_date) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+            if start_date >= today:
+                print(f"{output_filename} is up to date.")
+                return None
+    
+    print(f"Processing ingestion for {len(ticker_list)} assets into {output_filename} from {start_date} (Chunk Size: {chunk_size})...")
+    
+    # yf.download on chunks, combined column-wise
+    all_data = _download_chunks(ticker_list, chunk_size, max_workers, cache_ttl=cache_ttl,
+                                backend=backend, start=start_date, end=today)
 
     if all_data:
-        final_df = pd.concat(all_data, axis=1)
-        final_df.to_csv(output_path)
-        print(f"Success. Saved {len(final_df)} rows for {len(ticker_list)} assets to {output_path}")
+        new_data = pd.concat(all_data, axis=1, copy=False)
+        if has_history:
+            # Merged in memory; a re-delivered day replaces the stored row
+            final_df = pd.concat([pd.read_parquet(output_path), new_data])
+            final_df = final_df[~final_df.index.duplicated(keep='last')].sort_index()
+        else:
+            final_df = new_data
+        _write_parquet(final_df, output_path)
+        print(f"Success. Saved {len(final_df)} rows ({len(new_data)} new) for {len(ticker_list)} assets to {output_path}")
         return final_df
     
     return None
 
-def fetch_intraday_data(tickers, interval="1h", period="60d", chunk_size=50):
+def fetch_intraday_data(tickers, interval="1h", period="60d", chunk_size=20, max_workers=4,
+                        cache_ttl=INTRADAY_CACHE_TTL, backend="yfinance"):
     """
     Fetches intra-day data with chunking.
     """
-    output_filename = f"assets_{interval}_raw.csv"
+    output_filename = f"assets_{interval}_raw.parquet"
     output_path = os.path.join(RAW_DATA_DIR, output_filename)
     ticker_list = list(tickers.values())
     
     print(f"Fetching {interval} intraday for {len(ticker_list)} assets (Chunk Size: {chunk_size})...")
     
-    all_data = []
-    for chunk in chunk_list(ticker_list, chunk_size):
-        print(f"Downloading {interval} chunk: {chunk[:3]}...")
-        try:
-            chunk_data = yf.download(chunk, period=period, interval=interval, group_by='ticker', progress=False)
-            if not chunk_data.empty:
-                if len(chunk) == 1:
-                    chunk_data.columns = pd.MultiIndex.from_product([chunk, chunk_data.columns]).swaplevel()
-                all_data.append(chunk_data)
-            time.sleep(1)
-        except Exception as e:
-            print(f"Failed intraday chunk {chunk[:3]}: {e}")
+    all_data = _download_chunks(ticker_list, chunk_size, max_workers, label=f"{interval} chunk",
+                                cache_ttl=cache_ttl, backend=backend, period=period, interval=interval)
 
     if all_data:
-        final_df = pd.concat(all_data, axis=1)
-        final_df.to_csv(output_path)
+        final_df = pd.concat(all_data, axis=1, copy=False)
+        _write_parquet(final_df, output_path)
         print(f"Saved to {output_path}")
         return final_df
     
@@ -94,8 +200,8 @@ def main():
     yfinance_universe = {k: v['yfinance'] for k, v in ASSET_UNIVERSE.items()}
     
     # 1. Daily Updates (Unified Universe)
-    fetch_yfinance_data(yfinance_universe, START_DATE, "commodities_raw.csv") # Unified file
-    fetch_yfinance_data(MACRO_DRIVERS, START_DATE, "macro_raw.csv")
+    fetch_yfinance_data(yfinance_universe, START_DATE, "commodities_raw.parquet") # Unified file
+    fetch_yfinance_data(MACRO_DRIVERS, START_DATE, "macro_raw.parquet")
 
     # 2. Intra-day Updates (Unified Universe)
     fetch_intraday_data(yfinance_universe, interval="1h", period="60d")
@@ -1,47 +1,71 @@
 import os
+import sys
 import pandas as pd
 from abc import ABC, abstractmethod
+from types import MappingProxyType
+
+# Add src to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.fastcsv import write_csv
 
 class NewsProvider(ABC):
     @abstractmethod
     def fetch_news(self, start_date, end_date, tickers=None):
         pass
 
+# Shared, read-only mock corpus (built once per process, not per provider)
+_MOCK_EVENTS = MappingProxyType({
+    "2020-04-20": (
+        {"headline": "Oil prices crash into negative territory as demand vanishes", "source": "Reuters", "commodity": "CRUDE_OIL"},
+        {"headline": "WTI crude futures drop below zero in historic first", "source": "Bloomberg", "commodity": "CRUDE_OIL"}
+    ),
+    "2022-02-24": (
+        {"headline": "Russia invades Ukraine, triggering global commodity spike", "source": "AP", "commodity": "GOLD"},
+        {"headline": "Safe-haven gold surges as geopolitical tensions erupt", "source": "CNBC", "commodity": "GOLD"}
+    ),
+    "2011-09-05": (
+        {"headline": "Gold hits all-time high of $1,900 as debt crisis looms", "source": "FT", "commodity": "GOLD"},
+    )
+})
+
+def _events_frame(mock_events):
+    """Flattens the events into a time-sorted frame; fetches are index slices."""
+    events = pd.DataFrame([
+        {**item, 'timestamp_utc': date_str + " 12:00:00"}
+        for date_str, items in mock_events.items()
+        for item in items
+    ])
+    return events.set_index(pd.DatetimeIndex(events['timestamp_utc'])).sort_index(kind='stable')
+
+_MOCK_EVENTS_DF = _events_frame(_MOCK_EVENTS)
+
 class MockNewsProvider(NewsProvider):
     """
     Generates synthetic but relevant news for testing the pipeline 
     on historical inflection points.
     """
     def __init__(self):
-        self.mock_events = {
-            "2020-04-20": [
-                {"headline": "Oil prices crash into negative territory as demand vanishes", "source": "Reuters", "commodity": "CRUDE_OIL"},
-                {"headline": "WTI crude futures drop below zero in historic first", "source": "Bloomberg", "commodity": "CRUDE_OIL"}
-            ],
-            "2022-02-24": [
-                {"headline": "Russia invades Ukraine, triggering global commodity spike", "source": "AP", "commodity": "GOLD"},
-                {"headline": "Safe-haven gold surges as geopolitical tensions erupt", "source": "CNBC", "commodity": "GOLD"}
-            ],
-            "2011-09-05": [
-                {"headline": "Gold hits all-time high of $1,900 as debt crisis looms", "source": "FT", "commodity": "GOLD"}
-            ]
-        }
+        self.mock_events = _MOCK_EVENTS
+        self._events_df = _MOCK_EVENTS_DF
 
     def fetch_news(self, start_date, end_date, tickers=None):
-        # Filter mock events by date range
-        news = []
-        for date_str, items in self.mock_events.items():
-            if start_date <= date_str <= end_date:
-                for item in items:
-                    item['timestamp_utc'] = date_str + " 12:00:00"
-                    news.append(item)
-        return pd.DataFrame(news)
+        # Filter mock events by date range (end date inclusive)
+        return self._events_df.loc[start_date:end_date].reset_index(drop=True)
 
 class HistoricalNewsIngestor(NewsProvider):
     """
     Ingests historical news from a CSV file (e.g., Kaggle Gold Dataset).
     Expected columns: headline/text, sentiment (optional), date
     """
+    COL_MAP = {
+        'text': 'headline',
+        'news': 'headline', 
+        'date': 'timestamp_utc',
+        'label': 'sentiment'
+    }
+    # Canonical columns kept from the file; anything else is skipped by the parser
+    COLUMNS = ('headline', 'timestamp_utc', 'sentiment', 'source', 'commodity')
+    
     def __init__(self, csv_path):
         self.csv_path = csv_path
         
@@ -50,32 +74,31 @@ class HistoricalNewsIngestor(NewsProvider):
             print(f"Historical file not found at {self.csv_path}")
             return pd.DataFrame()
             
-        df = pd.read_csv(self.csv_path)
-        
         # Normalize columns
-        # Map unique columns from potential datasets
-        col_map = {
-            'text': 'headline',
-            'news': 'headline', 
-            'date': 'timestamp_utc',
-            'label': 'sentiment'
-        }
-        df = df.rename(columns=col_map)
+        # Map unique columns from potential datasets, resolved against the header
+        # only, so the data itself is parsed once with just the columns we keep
+        header = pd.read_csv(self.csv_path, nrows=0).columns
+        name_map = {}
+        for col in header:
+            canonical = self.COL_MAP.get(col, col)
+            if canonical in self.COLUMNS and canonical not in name_map.values():
+                name_map[col] = canonical
         
         # Ensure required columns
-        if 'headline' not in df.columns:
+        if 'headline' not in name_map.values():
             print("Error: CSV must contain 'headline', 'text', or 'news' column.")
             return pd.DataFrame()
             
-        if 'timestamp_utc' not in df.columns:
-            # If no date, generate dummy or fail. For this specific dataset, we might need to parse.
-            # The sample has 'date'.
-            pass
+        # If no date, this fails on the filter below; the sample dataset has 'date'.
+        date_cols = [col for col, canonical in name_map.items() if canonical == 'timestamp_utc']
+        
+        # pyarrow's multithreaded parser does the reading and date parsing in one pass
+        df = pd.read_csv(self.csv_path, engine='pyarrow', usecols=list(name_map),
+                         parse_dates=date_cols).rename(columns=name_map)
             
-        # Filter by date
+        # Filter by date (no-op conversion when the parser already produced datetimes)
         df['timestamp_utc'] = pd.to_datetime(df['timestamp_utc'])
-        mask = (df['timestamp_utc'] >= pd.to_datetime(start_date)) & (df['timestamp_utc'] <= pd.to_datetime(end_date))
-        df = df[mask]
+        df = df[df['timestamp_utc'].between(pd.to_datetime(start_date), pd.to_datetime(end_date))]
         
         # Add metadata
         if 'source' not in df.columns:
@@ -93,7 +116,7 @@ class NewsIngestionManager:
         print(f"Ingesting news from {start_date} to {end_date}...")
         news_df = self.provider.fetch_news(start_date, end_date)
         if not news_df.empty:
-            news_df.to_csv(output_path, index=False)
+            write_csv(news_df, output_path, index=False)
             print(f"Saved {len(news_df)} news items to {output_path}")
         else:
             print("No news found for the given range.")
@@ -0,0 +1,48 @@
+import numpy as np
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.jit import njit, prange
+
+@njit(parallel=True, cache=True)
+def rolling_vol(x, w, periods_per_year=252):
+    """
+    Annualized rolling sample std (ddof=1) of each column of a (T, N) returns
+    matrix in one streaming pass per column: Welford mean/M2 updated as a row
+    enters and the row w back leaves. Like Series.rolling(w).std(), a window
+    holding any NaN/inf is NaN and a window of identical values is exactly 0.
+    """
+    T, N = x.shape
+    out = np.full((T, N), np.nan)
+    scale = np.sqrt(periods_per_year)
+    for j in prange(N):
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        same = 0
+        for i in range(T):
+            v = x[i, j]
+            if np.isfinite(v):
+                n += 1
+                d = v - mean
+                mean += d / n
+                m2 += d * (v - mean)
+                same = same + 1 if i > 0 and v == x[i - 1, j] else 1
+            else:
+                same = 0
+            if i >= w:
+                old = x[i - w, j]
+                if np.isfinite(old):
+                    n -= 1
+                    if n == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        d = old - mean
+                        mean -= d / n
+                        m2 -= d * (old - mean)
+            if n == w and n > 1:
+                out[i, j] = 0.0 if same >= w else np.sqrt(max(m2, 0.0) / (n - 1)) * scale
+    return out
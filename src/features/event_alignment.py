@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import os
 import sys
 
@@ -14,42 +15,50 @@ def align_news_to_inflections(news_path, inflection_path, window_days=1):
         print("Required files not found.")
         return pd.DataFrame()
         
-    news_df = pd.read_csv(news_path)
-    inf_df = pd.read_csv(inflection_path, index_col=0, parse_dates=True)
+    # Low-cardinality labels as categoricals: interned once instead of one str per row
+    news_df = pd.read_csv(news_path, engine='c', memory_map=True,
+                          dtype={'source': 'category', 'commodity': 'category'})
+    inf_df = pd.read_csv(inflection_path, index_col=0, parse_dates=True, engine='c', memory_map=True,
+                         dtype={'commodity': 'category', 'move_type': 'category'})
     
     # Ensure news timestamps are datetime
     news_df['timestamp_utc'] = pd.to_datetime(news_df['timestamp_utc'])
-    news_df['date'] = news_df['timestamp_utc'].dt.date
-    news_df['date'] = pd.to_datetime(news_df['date'])
+    # Calendar day, staying in datetime64 (no per-row date objects)
+    news_df['date'] = news_df['timestamp_utc'].dt.tz_localize(None).dt.normalize()
     
-    aligned_events = []
+    # Every (inflection, news) pair within the window, found with two binary
+    # searches per news item on the sorted inflection dates
+    window = pd.Timedelta(days=window_days)
+    order = np.argsort(inf_df.index.values, kind='stable')
+    inf_dates = inf_df.index.values[order]
+    news_dates = news_df['date'].values
+    lo = np.searchsorted(inf_dates, news_dates - window, side='left')
+    hi = np.searchsorted(inf_dates, news_dates + window, side='right')
+    counts = np.maximum(hi - lo, 0)
     
-    for idx, row in inf_df.iterrows():
-        # Define window
-        start_win = idx - pd.Timedelta(days=window_days)
-        end_win = idx + pd.Timedelta(days=window_days)
-        
-        # Filter news for this window and commodity (if specified in news)
-        mask = (news_df['date'] >= start_win) & (news_df['date'] <= end_win)
-        
-        # If news has a 'commodity' field, match it
-        comm_name = row['commodity']
-        comm_mask = (news_df['commodity'] == comm_name) | (news_df['commodity'].isna())
-        
-        window_news = news_df[mask & comm_mask]
-        
-        for _, news_item in window_news.iterrows():
-            aligned_events.append({
-                "inflection_date": idx,
-                "commodity": comm_name,
-                "move_type": row['move_type'],
-                "magnitude": row['magnitude'],
-                "headline": news_item['headline'],
-                "source": news_item['source'],
-                "news_date": news_item['date']
-            })
-            
-    return pd.DataFrame(aligned_events)
+    news_pos = np.repeat(np.arange(len(news_df)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    inf_pos = order[np.repeat(lo, counts) + offsets]
+    
+    # Commodity must match, unless the news item has none
+    news_comm = news_df['commodity'].to_numpy()[news_pos]
+    inf_comm = inf_df['commodity'].to_numpy()[inf_pos]
+    keep = (news_comm == inf_comm) | pd.isna(news_comm)
+    news_pos, inf_pos = news_pos[keep], inf_pos[keep]
+    
+    # Grouped by inflection row, news in file order
+    by_inflection = np.lexsort((news_pos, inf_pos))
+    news_pos, inf_pos = news_pos[by_inflection], inf_pos[by_inflection]
+    
+    return pd.DataFrame({
+        "inflection_date": inf_df.index[inf_pos],
+        "commodity": inf_df['commodity'].to_numpy()[inf_pos],
+        "move_type": inf_df['move_type'].to_numpy()[inf_pos],
+        "magnitude": inf_df['magnitude'].to_numpy()[inf_pos],
+        "headline": news_df['headline'].to_numpy()[news_pos],
+        "source": news_df['source'].to_numpy()[news_pos],
+        "news_date": news_df['date'].to_numpy()[news_pos]
+    })
 
 def main():
     news_path = "data/raw/news_raw.csv"
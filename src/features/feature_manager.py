@@ -1,6 +1,9 @@
 import os
 import json
+import shutil
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from typing import Optional
 from core.contracts import FeatureMetadata
 from datetime import datetime
@@ -9,7 +12,12 @@ class FeatureStoreManager:
     """
     Manages versioned feature artifacts.
     Enforces metadata binding and consistent naming conventions.
+    Data is a zstd Parquet dataset partitioned by year (year=YYYY/ directories),
+    so loads can skip cold history.
     """
+    PARTITION_COL = "year"
+    METADATA_KEY = b"feature_metadata" # FeatureMetadata JSON in the Parquet schema
+    
     def __init__(self, base_path: str = "data/features"):
         self.base_path = base_path
         os.makedirs(self.base_path, exist_ok=True)
@@ -22,7 +30,8 @@ class FeatureStoreManager:
 
     def save_feature_set(self, df: pd.DataFrame, metadata: FeatureMetadata):
         """
-        Saves a dataframe as a versioned artifact with sidecar metadata.
+        Saves a dataframe as a versioned, self-describing artifact: the
+        metadata travels in the Parquet schema of every partition file.
         """
         data_path, meta_path = self._get_paths(metadata.feature_set_id, metadata.version)
         
@@ -30,28 +39,61 @@ class FeatureStoreManager:
         if not isinstance(df.index, pd.DatetimeIndex):
             raise ValueError("Feature DataFrame must have a DatetimeIndex")
             
-        # Save Data
-        df.to_parquet(data_path)
+        table = pa.Table.from_pandas(df.assign(**{self.PARTITION_COL: df.index.year}))
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            self.METADATA_KEY: metadata.model_dump_json().encode()
+        })
         
-        # Save Metadata
-        with open(meta_path, 'w') as f:
-            f.write(metadata.json(indent=4))
+        # Save Data: build the dataset beside the target, then swap it in, so a
+        # re-save never leaves stale partitions or mixes old and new files
+        tmp_path = data_path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        pq.write_to_dataset(table, root_path=tmp_path, partition_cols=[self.PARTITION_COL],
+                            compression='zstd', compression_level=3, use_dictionary=True)
+        if os.path.isdir(data_path):
+            shutil.rmtree(data_path)
+        elif os.path.exists(data_path):
+            os.remove(data_path) # single-file artifact from before partitioning
+        os.replace(tmp_path, data_path)
+        
+        # A sidecar from the two-file layout would now be stale
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
             
         print(f"Feature set saved: {data_path}")
 
-    def load_feature_set(self, feature_set_id: str, version: str) -> hash:
+    def load_feature_set(self, feature_set_id: str, version: str,
+                         min_year: Optional[int] = None) -> hash:
         """
         Returns (DataFrame, FeatureMetadata)
+        :param min_year: only partitions from this year on are read
         """
         data_path, meta_path = self._get_paths(feature_set_id, version)
         
-        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        if not os.path.exists(data_path):
             raise FileNotFoundError(f"Feature set {feature_set_id} v{version} not found.")
             
-        df = pd.read_parquet(data_path)
-        with open(meta_path, 'r') as f:
-            meta_json = json.load(f)
-            metadata = FeatureMetadata(**meta_json)
+        partitioned = os.path.isdir(data_path)
+        filters = [(self.PARTITION_COL, '>=', min_year)] if partitioned and min_year is not None else None
+        table = pq.read_table(data_path, filters=filters)
+        
+        embedded = (table.schema.metadata or {}).get(self.METADATA_KEY)
+        if embedded is not None:
+            metadata = FeatureMetadata.model_validate_json(embedded)
+        elif os.path.exists(meta_path):
+            # Artifacts written before the metadata was embedded
+            with open(meta_path, 'r') as f:
+                meta_json = json.load(f)
+                metadata = FeatureMetadata(**meta_json)
+        else:
+            raise FileNotFoundError(f"Feature set {feature_set_id} v{version} has no metadata.")
+            
+        df = table.to_pandas()
+        if partitioned:
+            df = df.drop(columns=self.PARTITION_COL).sort_index(kind='stable')
+        elif min_year is not None:
+            df = df[df.index.year >= min_year]
             
         return df, metadata
 
@@ -5,38 +5,43 @@ import sys
 # Add src to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import PROCESSED_DATA_DIR, COMMODITIES
+from utils.fastcsv import write_csv
 
 def build_feature_store():
-    market_path = os.path.join(PROCESSED_DATA_DIR, "market_features.csv")
-    macro_path = os.path.join(PROCESSED_DATA_DIR, "macro_features.csv")
+    market_path = os.path.join(PROCESSED_DATA_DIR, "market_features.parquet")
+    macro_path = os.path.join(PROCESSED_DATA_DIR, "macro_features.parquet")
     
     if not (os.path.exists(market_path) and os.path.exists(macro_path)):
         print("Required processed files not found.")
         return
 
-    market = pd.read_csv(market_path, index_col=0, parse_dates=True)
-    macro = pd.read_csv(macro_path, index_col=0, parse_dates=True)
+    market = pd.read_parquet(market_path)
+    macro = pd.read_parquet(macro_path)
     
     # Merge on date
     # We use 'outer' join and then ffill to ensure no holes, but for prediction 
     # we usually want 'inner' to only have days where both exist.
-    full_df = pd.concat([market, macro], axis=1).sort_index()
+    full_df = market.join(macro, how='outer').sort_index()
     
     # Forward fill macro data for weekends/holidays if market is open
     full_df = full_df.ffill()
     
+    # float32 halves the bytes every downstream scan (shift, dropna, models) touches
+    full_df = full_df.astype({c: 'float32' for c in full_df.select_dtypes('float64').columns})
+    
     # Create Targets for each commodity (next-day log return)
     # Target: GC=F_ret_1d shifted back 1 day (so row t has return of t+1)
-    for commodity, ticker in COMMODITIES.items():
-        ret_col = f"{ticker}_ret_1d"
-        if ret_col in full_df.columns:
-            full_df[f"target_{ticker}_next_ret"] = full_df[ret_col].shift(-1)
+    # Column names resolved once, then one shift over the 2-D block
+    tickers = [t for t in dict.fromkeys(COMMODITIES.values()) if f"{t}_ret_1d" in full_df.columns]
+    targets = full_df[[f"{t}_ret_1d" for t in tickers]].shift(-1)
+    targets.columns = [f"target_{t}_next_ret" for t in tickers]
+    full_df = pd.concat([full_df, targets], axis=1, copy=False)
             
     # Remove rows with NaN (especially the last row where target is NaN)
     full_df = full_df.dropna()
     
     output_path = os.path.join(PROCESSED_DATA_DIR, "feature_store.csv")
-    full_df.to_csv(output_path)
+    write_csv(full_df, output_path)
     print(f"Feature store built with {len(full_df.columns)} columns and {len(full_df)} rows.")
     print(f"Saved to {output_path}")
     return full_df
@@ -6,6 +6,7 @@ import sys
 # Add src to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import PROCESSED_DATA_DIR, COMMODITIES
+from utils.jit import njit, prange
 
 def detect_inflection_points(df, commodity_ticker, std_threshold=2.0):
     """
@@ -26,12 +27,83 @@ def detect_inflection_points(df, commodity_ticker, std_threshold=2.0):
     upper = mean_ret + (std_threshold * std_ret)
     lower = mean_ret - (std_threshold * std_ret)
     
-    # Large Move Detection
-    inflections = df[(returns > upper) | (returns < lower)].copy()
-    inflections['move_type'] = np.where(inflections[ret_col] > upper, 'POSITIVE_SHOCK', 'NEGATIVE_SHOCK')
-    inflections['magnitude'] = inflections[ret_col].abs()
+    # Large Move Detection: one pass over the raw array, result built from the hits only
+    r = returns.to_numpy()
+    idx = np.flatnonzero((r > upper) | (r < lower))
+    hits = r[idx]
     
-    return inflections[['move_type', 'magnitude', ret_col, vol_col]]
+    return pd.DataFrame({
+        'move_type': np.where(hits > upper, 'POSITIVE_SHOCK', 'NEGATIVE_SHOCK'),
+        'magnitude': np.abs(hits),
+        ret_col: hits,
+        vol_col: df[vol_col].to_numpy()[idx]
+    }, index=df.index[idx])
+
+@njit(parallel=True, cache=True)
+def _threshold_sweep(R, std_threshold):
+    """
+    Fused per-column mean, sample std (NaN-skipping, as pandas) and threshold
+    test over a (T, N) returns matrix, one thread per column. Returns the
+    (T, N) hit mask and the upper/lower thresholds.
+    """
+    T, N = R.shape
+    hits = np.zeros((T, N), dtype=np.bool_)
+    upper = np.full(N, np.nan)
+    lower = np.full(N, np.nan)
+    for j in prange(N):
+        n = 0
+        total = 0.0
+        for i in range(T):
+            if not np.isnan(R[i, j]):
+                n += 1
+                total += R[i, j]
+        if n < 2:
+            continue
+        mean = total / n
+        ss = 0.0
+        for i in range(T):
+            if not np.isnan(R[i, j]):
+                ss += (R[i, j] - mean) ** 2
+        std = np.sqrt(ss / (n - 1))
+        upper[j] = mean + std_threshold * std
+        lower[j] = mean - std_threshold * std
+        for i in range(T):
+            r = R[i, j]
+            hits[i, j] = (r > upper[j]) or (r < lower[j])
+    return hits, upper, lower
+
+def detect_all_inflection_points(df, commodities, std_threshold=2.0):
+    """
+    detect_inflection_points for every {name: ticker} at once, in a single
+    kernel over the stacked returns. Returns one frame sorted by date (then
+    commodity order) with a 'commodity' column and each commodity's own
+    return/volatility columns, as concatenating the per-commodity results would.
+    """
+    present = {name: ticker for name, ticker in commodities.items()
+               if f"{ticker}_ret_1d" in df.columns and f"{ticker}_vol_20d" in df.columns}
+    if not present:
+        return pd.DataFrame()
+    
+    names = list(present)
+    ret_cols = [f"{present[name]}_ret_1d" for name in names]
+    vol_cols = [f"{present[name]}_vol_20d" for name in names]
+    R = np.ascontiguousarray(df[ret_cols].to_numpy(dtype=np.float64))
+    V = df[vol_cols].to_numpy(dtype=np.float64)
+    
+    hits, upper, _ = _threshold_sweep(R, float(std_threshold))
+    rows, cols = np.nonzero(hits) # row-major: date order, then commodity order
+    moves = R[rows, cols]
+    
+    out = {
+        'move_type': np.where(moves > upper[cols], 'POSITIVE_SHOCK', 'NEGATIVE_SHOCK'),
+        'magnitude': np.abs(moves)
+    }
+    for j in range(len(names)):
+        own = cols == j
+        out[ret_cols[j]] = np.where(own, moves, np.nan)
+        out[vol_cols[j]] = np.where(own, V[rows, j], np.nan)
+    out['commodity'] = np.asarray(names, dtype=object)[cols]
+    return pd.DataFrame(out, index=df.index[rows])
 
 def main():
     store_path = os.path.join(PROCESSED_DATA_DIR, "feature_store.csv")
@@ -39,19 +111,15 @@ def main():
         print("Feature store not found.")
         return
         
-    df = pd.read_csv(store_path, index_col=0, parse_dates=True)
-    
-    all_inflections = []
+    # Every feature column is numeric: declaring it skips the parser's type inference
+    header = pd.read_csv(store_path, index_col=0, nrows=0).columns
+    df = pd.read_csv(store_path, index_col=0, parse_dates=True, engine='c', memory_map=True,
+                     dtype=dict.fromkeys(header, 'float64'))
     
-    for name, ticker in COMMODITIES.items():
-        print(f"Detecting inflections for {name} ({ticker})...")
-        inf = detect_inflection_points(df, ticker)
-        if not inf.empty:
-            inf['commodity'] = name
-            all_inflections.append(inf)
+    print(f"Detecting inflections for {len(COMMODITIES)} commodities...")
+    inf_df = detect_all_inflection_points(df, COMMODITIES)
             
-    if all_inflections:
-        inf_df = pd.concat(all_inflections).sort_index()
+    if not inf_df.empty:
         output_path = os.path.join(PROCESSED_DATA_DIR, "inflection_points.csv")
         inf_df.to_csv(output_path)
         print(f"Detected {len(inf_df)} total inflection points across all commodities.")
@@ -10,13 +10,17 @@ from core.time_index import apply_causal_mask
 
 
 def process_macro_features():
-    raw_path = os.path.join(RAW_DATA_DIR, "macro_raw.csv")
-    if not os.path.exists(raw_path):
+    raw_path = os.path.join(RAW_DATA_DIR, "macro_raw.parquet")
+    legacy_path = os.path.join(RAW_DATA_DIR, "macro_raw.csv")
+    if os.path.exists(raw_path):
+        # Similar multi-index structure, stored typed
+        df = pd.read_parquet(raw_path)
+    elif os.path.exists(legacy_path):
+        df = pd.read_csv(legacy_path, header=[0, 1], index_col=0, parse_dates=True, skiprows=[2],
+                         engine='c', memory_map=True)
+    else:
         print(f"File not found: {raw_path}")
         return
-
-    # Similar multi-index structure
-    df = pd.read_csv(raw_path, header=[0, 1], index_col=0, parse_dates=True, skiprows=[2])
     
     available_levels = df.columns.get_level_values(0).unique()
     target_level = 'Adj Close' if 'Adj Close' in available_levels else 'Close'
@@ -27,26 +31,31 @@ def process_macro_features():
     # 2. Daily changes
     # 3. Yield curve slope (if we have 10Y and 2Y correctly)
     
-    macro_features = pd.DataFrame(index=adj_close.index)
+    # Whole-frame ops over the 2-D block instead of one column at a time
+    # (tuple columns from a multi-index keep their ticker level)
+    names = [col[1] if isinstance(col, tuple) else col for col in adj_close.columns]
+    prices = adj_close.set_axis(names, axis=1)
     
-    for col in adj_close.columns:
-        # Check if col is a tuple (multi-index)
-        col_name = col[1] if isinstance(col, tuple) else col
-        
-        # Log return for macro indices (t vs t-1, valid at t)
-        macro_features[f"{col_name}_dret"] = np.log(adj_close[col] / adj_close[col].shift(1))
-        
-        # 5d smoothing for cleaner signals (rolling mean at t includes t, valid at t)
-        macro_features[f"{col_name}_5d_ma"] = adj_close[col].rolling(5).mean()
+    # Log return for macro indices (t vs t-1, valid at t)
+    dret = np.log(prices / prices.shift(1)).add_suffix("_dret")
+    
+    # 5d smoothing for cleaner signals (rolling mean at t includes t, valid at t)
+    ma = prices.rolling(5).mean().add_suffix("_5d_ma")
+    
+    macro_features = pd.concat([dret, ma], axis=1)
+    # Per-indicator column order: X_dret, X_5d_ma, Y_dret, ...
+    macro_features = macro_features[[f"{name}{suffix}" for name in names
+                                     for suffix in ("_dret", "_5d_ma")]]
         
     # Yield Curve Slope (10Y - 2Y)
     # Note: tickers are ^TNX (10Y) and ^IRX (3M, using as proxy for now or check if we got 2Y)
     # In config.py: "UST_10Y": "^TNX", "UST_2Y": "^IRX"
     if "^TNX" in adj_close.columns and "^IRX" in adj_close.columns:
-        macro_features["yield_curve_slope"] = adj_close["^TNX"] - adj_close["^IRX"]
+        # Same index by construction, so subtract the raw arrays (no alignment join)
+        macro_features["yield_curve_slope"] = adj_close["^TNX"].to_numpy() - adj_close["^IRX"].to_numpy()
         
-    output_path = os.path.join(PROCESSED_DATA_DIR, "macro_features.csv")
-    macro_features.to_csv(output_path)
+    output_path = os.path.join(PROCESSED_DATA_DIR, "macro_features.parquet")
+    macro_features.to_parquet(output_path, compression='zstd')
     print(f"Macro features saved to {output_path}")
     return macro_features
 
@@ -7,19 +7,31 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import RAW_DATA_DIR, PROCESSED_DATA_DIR, LAG_WINDOWS
 from core.time_index import apply_causal_mask
+from features._kernels import rolling_vol
 
 
+def _column_names(df):
+    """Output name per column (tuple columns from a multi-index keep their ticker level)."""
+    return [col[1] if isinstance(col, tuple) else col for col in df.columns]
+
 def calculate_returns(df, windows):
-    """Calculates log returns for multiple windows."""
-    returns_df = pd.DataFrame(index=df.index)
-    for col in df.columns:
-        # Check if col is a tuple (multi-index)
-        col_name = col[1] if isinstance(col, tuple) else col
-        for w in windows:
-            # Shift by w to get value w days ago.
+    """
+    Calculates log returns for multiple windows: one array op per window over
+    the whole (T, N) price block, columns ordered per asset then window.
+    """
+    names = _column_names(df)
+    prices = df.to_numpy(dtype=np.float64)
+    T, N = prices.shape
+    out = np.full((T, N, len(windows)), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for k, w in enumerate(windows):
+            # Value w days ago sits w rows up.
             # Log return = log(Price_t / Price_{t-w})
             # This feature is known at time t.
-            returns_df[f"{col_name}_ret_{w}d"] = np.log(df[col] / df[col].shift(w))
+            if w < T:
+                out[w:, :, k] = np.log(prices[w:] / prices[:-w])
+    returns_df = pd.DataFrame(out.reshape(T, N * len(windows)), index=df.index,
+                              columns=[f"{name}_ret_{w}d" for name in names for w in windows])
     # Apply standard causal mask (shift 1) to ensure feature calculation at t 
     # relies on data closed at t-1 if strictly required, but for "current day close returns" 
     # typically we consider Close_t as known at Close_t.
@@ -33,35 +45,44 @@ def calculate_returns(df, windows):
     return returns_df
 
 def calculate_volatility(df, window=20):
-    """Calculates rolling realized volatility."""
-    vol_df = pd.DataFrame(index=df.index)
-    for col in df.columns:
-        col_name = col[1] if isinstance(col, tuple) else col
-        # rolling(window).std() at t includes t. Valid at t.
-        vol_df[f"{col_name}_vol_{window}d"] = df[col].pct_change().rolling(window).std() * np.sqrt(252)
-    return vol_df
+    """
+    Calculates rolling realized volatility of daily simple returns (as
+    pct_change: prices padded over gaps), one kernel pass over all columns.
+    """
+    prices = df.ffill().to_numpy(dtype=np.float64)
+    returns = np.full(prices.shape, np.nan)
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    # rolling(window).std() at t includes t. Valid at t.
+    return pd.DataFrame(rolling_vol(returns, window), index=df.index,
+                        columns=[f"{name}_vol_{window}d" for name in _column_names(df)])
 
 def calculate_momentum(df, windows):
     """Calculates momentum features (e.g., price relative to moving average)."""
-    mom_df = pd.DataFrame(index=df.index)
-    for col in df.columns:
-        col_name = col[1] if isinstance(col, tuple) else col
-        for w in windows:
-            # rolling(w).mean() at t includes t. Valid at t.
-            ma = df[col].rolling(w).mean()
-            mom_df[f"{col_name}_ma_{w}d_ratio"] = df[col] / ma
-    return mom_df
+    names = _column_names(df)
+    prices = df.to_numpy(dtype=np.float64)
+    T, N = prices.shape
+    out = np.empty((T, N, len(windows)))
+    for k, w in enumerate(windows):
+        # rolling(w).mean() at t includes t. Valid at t.
+        out[:, :, k] = prices / df.rolling(w).mean().to_numpy(dtype=np.float64)
+    return pd.DataFrame(out.reshape(T, N * len(windows)), index=df.index,
+                        columns=[f"{name}_ma_{w}d_ratio" for name in names for w in windows])
 
 def process_market_features():
-    raw_path = os.path.join(RAW_DATA_DIR, "commodities_raw.csv")
-    if not os.path.exists(raw_path):
+    raw_path = os.path.join(RAW_DATA_DIR, "commodities_raw.parquet")
+    legacy_path = os.path.join(RAW_DATA_DIR, "commodities_raw.csv")
+    if os.path.exists(raw_path):
+        # Parquet keeps the (ticker, price) column levels and dtypes; no header parsing
+        df = pd.read_parquet(raw_path)
+    elif os.path.exists(legacy_path):
+        # yfinance CSV output has headers on first two rows. 
+        # The 'Date' row (index 2) can be problematic.
+        # We skip row 2 (index 2) by using skiprows=[2]
+        df = pd.read_csv(legacy_path, header=[0, 1], index_col=0, parse_dates=True, skiprows=[2],
+                         engine='c', memory_map=True)
+    else:
         print(f"File not found: {raw_path}")
         return
-
-    # yfinance output has headers on first two rows. 
-    # The 'Date' row (index 2) can be problematic.
-    # We skip row 2 (index 2) by using skiprows=[2]
-    df = pd.read_csv(raw_path, header=[0, 1], index_col=0, parse_dates=True, skiprows=[2])
     
     # In recent yfinance versions, 'Adj Close' might be the same as 'Close' 
     # or named differently in the CSV. In the preview it shows 'Close' at the top.
@@ -78,8 +99,8 @@ def process_market_features():
     
     features = pd.concat([returns, vol, momentum], axis=1)
     
-    output_path = os.path.join(PROCESSED_DATA_DIR, "market_features.csv")
-    features.to_csv(output_path)
+    output_path = os.path.join(PROCESSED_DATA_DIR, "market_features.parquet")
+    features.to_parquet(output_path, compression='zstd')
     print(f"Market features saved to {output_path}")
     return features
 
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import torch
+from numpy.lib.stride_tricks import sliding_window_view
 from torch.utils.data import Dataset, DataLoader
 import os
 import sys
@@ -11,14 +12,16 @@ from config import PROCESSED_DATA_DIR
 
 class TimeSeriesDataset(Dataset):
     def __init__(self, X, y):
-        self.X = torch.FloatTensor(X)
-        self.y = torch.FloatTensor(y)
+        # One contiguous float32 block each (no copy if create_sequences built it);
+        # items are tensor views into it
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.y = np.ascontiguousarray(y, dtype=np.float32)
         
     def __len__(self):
         return len(self.X)
         
     def __getitem__(self, idx):
-        return self.X[idx], self.y[idx]
+        return torch.from_numpy(self.X[idx]), torch.as_tensor(self.y[idx])
 
 class SequenceGenerator:
     """
@@ -29,23 +32,32 @@ class SequenceGenerator:
         
     def create_sequences(self, df, target_col):
         """
-        Creates (N, window_size, dimensions) feature tensors and (N,) target tensors.
+        Creates (N, window_size, dimensions) float32 feature tensors and (N,) target tensors.
         """
         # All columns except target_ as features
         feature_cols = [c for c in df.columns if not c.startswith("target_")]
         
-        X_raw = df[feature_cols].values
-        y_raw = df[target_col].values
+        X_raw = df[feature_cols].to_numpy(dtype=np.float32)
+        y_raw = df[target_col].to_numpy(dtype=np.float32)
         
-        X, y = [], []
+        n = len(df) - self.window_size
+        if n <= 0:
+            return np.empty((0, self.window_size, X_raw.shape[1]), dtype=np.float32), y_raw[:0]
         
-        for i in range(len(df) - self.window_size):
-            X.append(X_raw[i : i + self.window_size])
-            y.append(y_raw[i + self.window_size])
-            
-        return np.array(X), np.array(y)
+        # Window i is rows [i, i + window_size), its target the row right after it.
+        # The strided view is materialized once, in C, instead of row by row.
+        windows = sliding_window_view(X_raw, (self.window_size, X_raw.shape[1]))[:n, 0]
+        return np.ascontiguousarray(windows), y_raw[self.window_size:]
 
-def prepare_loaders(df, target_col, window_size=20, batch_size=32, train_split=0.8):
+def prepare_loaders(df, target_col, window_size=20, batch_size=32, train_split=0.8,
+                    num_workers=0, drop_last=False):
+    """
+    Train/val DataLoaders over the sequences. Batches land in pinned memory
+    when a GPU is present, so host-to-device copies can run asynchronously.
+    num_workers > 0 assembles them in persistent background processes (the
+    calling script then needs a __main__ guard on spawn platforms);
+    drop_last drops the ragged last training batch.
+    """
     gen = SequenceGenerator(window_size=window_size)
     X, y = gen.create_sequences(df, target_col)
     
@@ -57,8 +69,15 @@ def prepare_loaders(df, target_col, window_size=20, batch_size=32, train_split=0
     train_ds = TimeSeriesDataset(X_train, y_train)
     val_ds = TimeSeriesDataset(X_val, y_val)
     
-    train_loader = DataLoader(train_ds, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_ds, batch_size=batch_size, shuffle=False)
+    loader_kwargs = dict(
+        batch_size=batch_size,
+        num_workers=num_workers,
+        pin_memory=torch.cuda.is_available(),
+        persistent_workers=num_workers > 0
+    )
+    
+    train_loader = DataLoader(train_ds, shuffle=True, drop_last=drop_last, **loader_kwargs)
+    val_loader = DataLoader(val_ds, shuffle=False, **loader_kwargs)
     
     return train_loader, val_loader, X_train.shape[2] # return feature dim
 
@@ -1,10 +1,70 @@
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.stattools import grangercausalitytests
+from scipy import stats
 import logging
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
+@njit(cache=True)
+def _lag_matrix(values, max_lag):
+    """(T, max_lag) matrix whose column k holds values lagged k + 1 steps (NaN before the start)."""
+    T = values.shape[0]
+    out = np.full((T, max_lag), np.nan)
+    for k in range(max_lag):
+        for t in range(k + 1, T):
+            out[t, k] = values[t - k - 1]
+    return out
+
+def _ssr(y, X):
+    """Residual sum of squares and rank of the least-squares fit of y on X."""
+    beta, _, rank, _ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ beta
+    return resid @ resid, rank
+
+def _granger_ssr_ftest(y, x, max_lag):
+    """
+    p-values of the SSR F-test that x Granger-causes y, for lags 1..max_lag,
+    as statsmodels' grangercausalitytests computes them (each lag on its own
+    trimmed sample, constant included): the restricted (own lags) and
+    unrestricted (own and x lags) models are solved with lstsq and the F
+    statistic built from their residual sums of squares. Raises ValueError
+    where statsmodels would refuse the test.
+    """
+    if len(y) <= 3 * max_lag + 1:
+        raise ValueError(f"Insufficient observations. Maximum allowable lag is {int((len(y) - 1) / 3) - 1}")
+    
+    # Lagged copies of both series are built once and sliced per lag
+    y_lags = _lag_matrix(y, max_lag)
+    x_lags = _lag_matrix(x, max_lag)
+    
+    p_values = {}
+    for lag in range(1, max_lag + 1):
+        target = y[lag:]
+        const = np.ones((len(target), 1))
+        own = np.hstack([y_lags[lag:, :lag], const])
+        joint = np.hstack([y_lags[lag:, :lag], x_lags[lag:, :lag], const])
+        if (joint.max(axis=0) == joint.min(axis=0)).sum() != 1:
+            raise ValueError("The x values include a column with constant values and so"
+                             " the test statistic cannot be computed.")
+        
+        ssr_own, _ = _ssr(target, own)
+        ssr_joint, rank = _ssr(target, joint)
+        tss = ((target - target.mean()) ** 2).sum()
+        if tss == 0 or ssr_joint == 0 or ssr_joint / tss < np.finfo(float).eps or rank != joint.shape[1]:
+            raise ValueError("The Granger causality test statistic cannot be computed "
+                             "because the VAR has a perfect fit of the data.")
+        
+        df_resid = len(target) - rank
+        f_stat = (ssr_own - ssr_joint) / ssr_joint / lag * df_resid
+        p_values[lag] = stats.f.sf(f_stat, lag, df_resid)
+    return p_values
+
 class CausalityEngine:
     """
     Identifies causal links between news sentiment and market moves.
@@ -41,12 +101,9 @@ class CausalityEngine:
                 return {}
                 
             # Run Test (returns ~ sentiment)
-            # checks if sentiment causes returns
-            res = grangercausalitytests(df[['returns', 'sentiment']], maxlag=max_lag, verbose=False)
-            
-            # Extract p-values for each lag
-            p_values = {lag: res[lag][0]['ssr_ftest'][1] for lag in res}
-            return p_values
+            # checks if sentiment causes returns; p-value of the SSR F-test per lag
+            return _granger_ssr_ftest(df['returns'].to_numpy(dtype=np.float64),
+                                      df['sentiment'].to_numpy(dtype=np.float64), max_lag)
             
         except Exception as e:
             logger.error(f"Granger test failed: {e}")
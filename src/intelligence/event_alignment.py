@@ -40,49 +40,46 @@ class EventAligner:
                 continue
                 
             comm_market = self.market_data[self.market_data['commodity'] == commodity].sort_index()
+            dates = comm_market.index
+            closes = comm_market['close'].to_numpy()
             
-            for _, news_item in group.iterrows():
-                event_time = news_item['timestamp_utc']
-                event_date = event_time.normalize() # Midnight of event day
-                
-                # Define Indices
-                start_date = event_date - timedelta(days=lookback_days)
-                end_date = event_date + timedelta(days=lookforward_days)
-                
-                # Slice Market Data
-                window = comm_market.loc[start_date:end_date]
-                
-                if window.empty:
-                    continue
-                    
-                # Calculate simple metrics (Placeholders for 'ImpactAnalyzer')
-                # Price at event (or closest prev close)
-                try:
-                    event_idx = window.index.get_indexer([event_date], method='nearest')[0]
-                    price_at_event = window.iloc[event_idx]['close']
-                    
-                    # Forward returns
-                    fwd_returns = {}
-                    for i in range(1, lookforward_days + 1):
-                        target_date = event_date + timedelta(days=i)
-                        # Find closest actual trading data
-                        target_indices = window.index.get_indexer([target_date], method='nearest')
-                        if len(target_indices) > 0:
-                            p_t = window.iloc[target_indices[0]]['close']
-                            ret = (p_t - price_at_event) / price_at_event
-                            fwd_returns[f'fwd_ret_{i}d'] = ret
-                        else:
-                            fwd_returns[f'fwd_ret_{i}d'] = None
-                            
-                    event_record = news_item.to_dict()
-                    event_record.update({
-                        'event_price': price_at_event,
-                        **fwd_returns
-                    })
-                    aligned_events.append(event_record)
-                    
-                except Exception as e:
-                    logger.debug(f"Failed to align event at {event_date}: {e}")
-                    continue
+            # Each event's window [event_date - lookback, event_date + lookforward] as
+            # a [lo, hi) position range into the commodity's market rows, all at once
+            event_dates = pd.DatetimeIndex(group['timestamp_utc'].dt.normalize()) # Midnight of event day
+            lo = dates.searchsorted(event_dates - timedelta(days=lookback_days), side='left')
+            hi = dates.searchsorted(event_dates + timedelta(days=lookforward_days), side='right')
+            keep = hi > lo # empty windows are skipped
+            if not keep.any():
+                continue
+            event_dates, lo, hi = event_dates[keep], lo[keep], hi[keep]
+            
+            # Price at event and i days later: closest trading day inside the window
+            prices = np.column_stack([
+                closes[self._nearest_in_window(dates, event_dates + timedelta(days=i), lo, hi)]
+                for i in range(lookforward_days + 1)
+            ])
+            
+            events = group[keep].reset_index(drop=True)
+            events['event_price'] = prices[:, 0]
+            fwd_returns = (prices[:, 1:] - prices[:, :1]) / prices[:, :1]
+            for i in range(1, lookforward_days + 1):
+                events[f'fwd_ret_{i}d'] = fwd_returns[:, i - 1]
+            aligned_events.append(events)
+
+        if not aligned_events:
+            return pd.DataFrame()
+        return pd.concat(aligned_events, ignore_index=True)
 
-        return pd.DataFrame(aligned_events)
+    @staticmethod
+    def _nearest_in_window(dates, targets, lo, hi):
+        """
+        Position of the date nearest each target among dates[lo:hi] (targets lie
+        inside their window); an equidistant pair resolves to the later date, as
+        Index.get_indexer(method='nearest') does.
+        """
+        pos = dates.searchsorted(targets, side='left')
+        right = np.minimum(pos, hi - 1)
+        left = np.maximum(pos - 1, lo)
+        left_gap = targets - dates[left]
+        right_gap = dates[right] - targets
+        return np.where(left_gap < right_gap, left, right)
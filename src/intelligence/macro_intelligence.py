@@ -21,10 +21,9 @@ class MacroRegimeClassifier:
             return "STABLE", 0.0
 
         # 1. Calc S&P Drawdown
+        # Only today's drawdown is needed: the expanding max at the last row is the series max
         sp500 = self.df[sp500_col]
-        rolling_max = sp500.expanding().max()
-        drawdown = (sp500 / rolling_max) - 1
-        current_dd = drawdown.iloc[-1]
+        current_dd = (sp500.iat[-1] / sp500.max()) - 1
 
         # 2. VIX Level
         vix = self.df[vix_col]
@@ -48,7 +48,7 @@ class RecommendationEngine:
                 p_rets = rets.iloc[-p:] if len(rets) >= p else rets
                 if p_rets.empty: continue
                 
-                cum_ret = (1 + p_rets).cumprod().iloc[-1] - 1
+                cum_ret = (1 + p_rets).prod() - 1
                 asset_stats[f"Return_{p}d"] = cum_ret
                 
             recommendations.append(asset_stats)
@@ -34,7 +34,7 @@ class SectorIntelligence:
             
             # Mean daily return across assets in sector
             avg_daily_rets = pd.concat(rets_list, axis=1).mean(axis=1)
-            cum_ret = (1 + avg_daily_rets).cumprod().iloc[-1] - 1
+            cum_ret = (1 + avg_daily_rets).prod() - 1
             
             # Cohesion: Are all assets moving together? 
             # (Standard deviation of returns across assets at each time step, averaged)
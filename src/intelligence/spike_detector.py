@@ -23,11 +23,16 @@ class SpikeDetector:
         """
         Detects spikes using Polars.
         Args:
-            data_path_or_df: Path to Parquet/CSV file OR a Polars DataFrame.
+            data_path_or_df: Path to Parquet/CSV file, a partitioned Parquet
+                directory (e.g. data/raw/bhav.parquet) OR a Polars DataFrame.
         """
         # Load Data
         if isinstance(data_path_or_df, str):
-            if data_path_or_df.endswith('.parquet'):
+            if os.path.isdir(data_path_or_df):
+                # Partition files carry DATE themselves; the lazy scan reads only the columns used
+                df_lazy = pl.scan_parquet(os.path.join(data_path_or_df, "**", "*.parquet"),
+                                          hive_partitioning=False)
+            elif data_path_or_df.endswith('.parquet'):
                 df_lazy = pl.scan_parquet(data_path_or_df)
             else:
                 df_lazy = pl.scan_csv(data_path_or_df, ignore_errors=True)
@@ -119,11 +124,13 @@ class SpikeDetector:
 
 if __name__ == "__main__":
     try:
-        # Prefer Parquet
-        parquet_path = "data/parquet/bse_history_raw.parquet"
-        csv_path = "data/raw/bse_history_raw.csv"
-        
-        path = parquet_path if os.path.exists(parquet_path) else csv_path
+        # Prefer the partitioned store written by BSEHistoricalFetcher, then legacy files
+        candidates = [
+            "data/raw/bhav.parquet",
+            "data/parquet/bse_history_raw.parquet",
+            "data/raw/bse_history_raw.csv"
+        ]
+        path = next((p for p in candidates if os.path.exists(p)), candidates[-1])
         
         if os.path.exists(path):
             detector = SpikeDetector()
@@ -16,6 +16,13 @@ class UnicornHunter:
         """Calculates Relative Strength line."""
         return asset_price / benchmark_price
 
+    @staticmethod
+    def _last_sma(values, window):
+        """Last value of rolling(window).mean() without building the full series."""
+        if len(values) < window:
+            return np.nan
+        return values[-window:].mean()
+
     def identify_unicorns(self, lookback_days=126):
         """
         Scans all assets for unicorn signatures.
@@ -35,27 +42,31 @@ class UnicornHunter:
         for col in close_cols:
             asset_id = col.replace("_Close", "")
             asset_price = self.df[col]
+            price_np = asset_price.to_numpy(dtype=float)
+            last_price = price_np[-1]
             
             # 1. Acceleration: Is the moving average accelerating?
             # 50d MA > 150d MA > 200d MA (Mark Minervini style)
-            sma50 = asset_price.rolling(50).mean()
-            sma150 = asset_price.rolling(150).mean()
-            sma200 = asset_price.rolling(200).mean()
+            # Only the latest value of each MA is needed
+            sma50 = self._last_sma(price_np, 50)
+            sma150 = self._last_sma(price_np, 150)
+            sma200 = self._last_sma(price_np, 200)
             
             # 2. Relative Strength (RS) Rank
-            rs_line = self._calculate_rs_line(asset_price, bench_price)
+            rs_line = self._calculate_rs_line(asset_price.iloc[-lookback_days:], bench_price.iloc[-lookback_days:])
             # RS momentum: is the RS line hitting new highs?
-            rs_new_high = rs_line.iloc[-1] >= rs_line.iloc[-lookback_days:].max()
+            rs_new_high = rs_line.iloc[-1] >= rs_line.max()
             
             # 3. Volume Intensity
             vol_col = f"{asset_id}_Volume"
             vol_intensity = 0
             if vol_col in self.df.columns:
-                avg_vol = self.df[vol_col].rolling(50).mean()
-                vol_intensity = self.df[vol_col].iloc[-1] / avg_vol.iloc[-1] if avg_vol.iloc[-1] > 0 else 0
+                vol_np = self.df[vol_col].to_numpy(dtype=float)
+                avg_vol = self._last_sma(vol_np, 50)
+                vol_intensity = vol_np[-1] / avg_vol if avg_vol > 0 else 0
 
             # Unicorn Criteria Checklist:
-            is_trend_aligned = (asset_price.iloc[-1] > sma50.iloc[-1] > sma150.iloc[-1] > sma200.iloc[-1])
+            is_trend_aligned = (last_price > sma50 > sma150 > sma200)
             is_rs_leader = rs_new_high
             is_explosive = vol_intensity > 2.0 # Current volume is 2x average
             
@@ -71,7 +82,7 @@ class UnicornHunter:
                     "RS_Status": "Leader" if is_rs_leader else "Normal",
                     "Trend": "Accelerating" if is_trend_aligned else "Consolidating",
                     "Volume_Intensity": f"{vol_intensity:.1f}x",
-                    "Current_Price": asset_price.iloc[-1]
+                    "Current_Price": last_price
                 })
 
         return pd.DataFrame(unicorns).sort_values(by="Unicorn_Score", ascending=False)
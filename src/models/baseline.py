@@ -3,6 +3,8 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 import numpy as np
 
+from utils.jit import njit
+
 class ElasticNetBaseline:
     """
     Standard ElasticNet baseline with scaling.
@@ -20,5 +22,30 @@ class ElasticNetBaseline:
     def predict(self, X):
         return self.pipeline.predict(X)
 
+@njit(cache=True)
+def _ols_fit(X, y):
+    """Least-squares coefficients with the intercept first."""
+    Xb = np.ones((X.shape[0], X.shape[1] + 1))
+    Xb[:, 1:] = X
+    return np.linalg.lstsq(Xb, y)[0]
+
+@njit(cache=True)
+def _ols_predict(X, coef):
+    return X @ coef[1:] + coef[0]
+
+class OLSBaseline:
+    """
+    Closed-form linear regression with intercept.
+    Fit/predict are pure NumPy kernels, so walk_forward.run_backtest can
+    evaluate every split in one threaded Numba call.
+    """
+    numba_kernels = (_ols_fit, _ols_predict)
+    
+    def fit(self, X, y):
+        self.coef_ = _ols_fit(np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        
+    def predict(self, X):
+        return _ols_predict(np.asarray(X, dtype=np.float64), self.coef_)
+
 def get_baseline_model():
     return ElasticNetBaseline
@@ -72,7 +72,7 @@ class ModelSelector:
             raise ValueError(f"No retired models found for {model_family}")
         
         # Get most recently retired
-        retired_models.sort(key=lambda x: x.get('promoted_at', ''), reverse=True)
+        retired_models.sort(key=lambda x: x.get('promoted_at_ts') or 0.0, reverse=True)
         rollback_model = retired_models[0]
         
         self.registry.promote_to_champion(rollback_model['model_id'])
@@ -32,22 +32,25 @@ class NLPProcessor:
             self.analyzer = SentimentIntensityAnalyzer()
             self.backend = "vader"
 
+    @staticmethod
+    def _finbert_score(result: Dict) -> float:
+        label = result['label'] # 'positive', 'negative', 'neutral'
+        score = result['score']
+        
+        if label == 'positive':
+            return score
+        elif label == 'negative':
+            return -score
+        else:
+            return 0.0
+
     def get_sentiment(self, text: str) -> float:
         """
         Extracts a scalar sentiment score (-1 to 1).
         """
         if self.backend == "finbert" and self.model_loaded:
             try:
-                result = self.pipe(text)[0]
-                label = result['label'] # 'positive', 'negative', 'neutral'
-                score = result['score']
-                
-                if label == 'positive':
-                    return score
-                elif label == 'negative':
-                    return -score
-                else:
-                    return 0.0
+                return self._finbert_score(self.pipe(text)[0])
             except Exception as e:
                 # Silent fallback to neutral or logs if needed
                 return 0.0
@@ -57,12 +60,31 @@ class NLPProcessor:
             return score['compound']
         return 0.0
 
+    def get_sentiment_batch(self, texts: List[str], batch_size: int = 32) -> List[float]:
+        """
+        Scores many texts at once. For FinBERT this is a single pipeline call,
+        so tokenization and the forward pass are batched instead of per text.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        
+        if self.backend == "finbert" and self.model_loaded:
+            try:
+                results = self.pipe(texts, batch_size=batch_size)
+                return [self._finbert_score(r) for r in results]
+            except Exception as e:
+                # Fall back to per-text scoring so one bad input doesn't zero the batch
+                return [self.get_sentiment(t) for t in texts]
+                
+        return [self.get_sentiment(t) for t in texts]
+
     def process_headlines(self, df: pd.DataFrame, headline_col: str = 'headline') -> pd.DataFrame:
         """
         Applies sentiment extraction to a dataframe of headlines.
         """
         df = df.copy()
-        df['sentiment_score'] = df[headline_col].apply(self.get_sentiment)
+        df['sentiment_score'] = self.get_sentiment_batch(df[headline_col].tolist())
         return df
 
     def aggregate_sentiment(self, df: pd.DataFrame, freq: str = '1H') -> pd.DataFrame:
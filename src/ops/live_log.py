@@ -0,0 +1,71 @@
+import os
+import re
+import mmap
+from typing import Dict, Iterator, List, Tuple
+
+# One pass per line: either a prediction (groups 1-3) or a shock (groups 4-6)
+_LIVE_RE = re.compile(
+    r"PREDICTION.*?Med=([-\d\.]+)% \| Range=\[([-\d\.]+)%, ([-\d\.]+)%\]"
+    r"|SHOCK DETECTED: (\S+) moved ([-\d\.]+)% at (.+)$"
+)
+
+def tail_lines(path: str, max_lines: int = 500) -> Iterator[str]:
+    """
+    Yields the lines of a file newest-first. The file is memory-mapped and
+    scanned backwards for newlines, so only the tail pages are touched and
+    repeated reads are served from the page cache without copying the log.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return
+        try:
+            end = mm.size()
+            emitted = 0
+            while end > 0 and emitted < max_lines:
+                start = mm.rfind(b"\n", 0, end) + 1
+                if start < end:
+                    yield mm[start:end].decode('utf-8', errors='replace')
+                    emitted += 1
+                end = start - 1
+        finally:
+            mm.close()
+
+def parse_live_logs(log_path: str, max_predictions: int = 20, max_shocks: int = 10,
+                    max_lines: int = 500) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Extracts the latest predictions and shocks written by run_live_intelligence.
+    Returns (predictions, shocks), each newest-first.
+    """
+    predictions, shocks = [], []
+    if not os.path.exists(log_path):
+        return predictions, shocks
+
+    for line in tail_lines(log_path, max_lines=max_lines):
+        match = _LIVE_RE.search(line)
+        if match is None:
+            continue
+        
+        if match.group(1) is not None:
+            if len(predictions) < max_predictions:
+                predictions.append({
+                    "timestamp": line[:19],
+                    "p50": float(match.group(1)) / 100.0,
+                    "p05": float(match.group(2)) / 100.0,
+                    "p95": float(match.group(3)) / 100.0
+                })
+        elif len(shocks) < max_shocks:
+            magnitude = float(match.group(5)) / 100.0
+            shocks.append({
+                "timestamp": match.group(6).strip(),
+                "ticker": match.group(4),
+                "magnitude": magnitude,
+                "type": "POSITIVE_SHOCK" if magnitude > 0 else "NEGATIVE_SHOCK"
+            })
+
+        if len(predictions) >= max_predictions and len(shocks) >= max_shocks:
+            break
+
+    return predictions, shocks
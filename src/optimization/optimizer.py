@@ -76,8 +76,7 @@ class StrategyOptimizer:
             engine = BacktestEngine(initial_capital=100_000, slippage_bps=0, commission_bps=0)
             
             try:
-                engine.run_backtest(self.data, allocations)
-                performance = pd.DataFrame([vars(s) for s in engine.history])
+                performance = engine.run_backtest(self.data, allocations)
                 
                 # 5. Calculate Objective
                 # Performance df has 'equity' column
@@ -70,11 +70,8 @@ class WalkForwardOptimizer:
             allocations = strategy.generate_allocations(test_signal_objects)
             
             engine = BacktestEngine(initial_capital=100_000, slippage_bps=0, commission_bps=0)
-            engine.run_backtest(test_data, allocations)
-            
-            # History is a list of PortfolioState objects
-            history_data = [vars(s) for s in engine.history]
-            perf = pd.DataFrame(history_data)
+            # History is a columnar frame: date, cash, equity, per-asset quantities
+            perf = engine.run_backtest(test_data, allocations)
             if perf.empty:
                 returns = pd.Series()
             else:
@@ -22,7 +22,7 @@ logger = setup_logger("daily_update", log_file="daily_update.log")
 
 def update_market_data():
     logger.info("Updating Market Data...")
-    fetch_yfinance_data(COMMODITIES, START_DATE, "commodities_raw.csv")
+    fetch_yfinance_data(COMMODITIES, START_DATE, "commodities_raw.parquet")
 
 def update_news_data():
     logger.info("Updating News Data...")
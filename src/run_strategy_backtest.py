@@ -57,7 +57,7 @@ def main():
         
         # Apply Vol Targeting (if vol data exists, else 1.0)
         vol_val = store_df.get(vol_col, pd.Series(0.02, index=store_df.index)) # fallback
-        vol_weights = vol_val.apply(lambda x: sizer.calculate_vol_target_weight(x) if x > 0 else 1.0)
+        vol_weights = sizer.calculate_vol_target_weights(vol_val, fallback=1.0)
         adjusted_signals = sig * vol_weights
         
         # Calculate Returns
@@ -17,6 +17,17 @@ class PositionSizer:
             return 0
         return self.target_vol / current_vol
 
+    def calculate_vol_target_weights(self, vol_series, fallback=1.0):
+        """
+        Vectorized calculate_vol_target_weight over a volatility series.
+        Non-positive or missing vol gets the fallback weight.
+        """
+        vol = np.asarray(vol_series, dtype=float)
+        valid = vol > 0
+        weights = np.full(vol.shape, fallback, dtype=float)
+        np.divide(self.target_vol, vol, out=weights, where=valid)
+        return pd.Series(weights, index=getattr(vol_series, 'index', None))
+
     def apply_kelly_criterion(self, win_prob, win_loss_ratio):
         """
         Kelly Criterion: f* = p/a - q/b 
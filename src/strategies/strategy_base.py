@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import pandas as pd
+import numpy as np
 from typing import Dict, Any
 from core.risk import CapitalConstitution, PortfolioState
 
@@ -38,13 +39,9 @@ class BaseStrategy(ABC):
         # 3. Volatility Scalar
         vol_scalar = self.constitution.get_vol_scalar(state)
         
-        approved_positions = {}
-        for symbol, raw_size in raw_signals.items():
-            # Apply Scalar
-            scaled_size = raw_size * vol_scalar
+        # Apply Scalar, then 4. Limit Check - one vectorized pass over every symbol
+        symbols = list(raw_signals.keys())
+        scaled_sizes = np.fromiter(raw_signals.values(), dtype=float, count=len(symbols)) * vol_scalar
+        final_sizes = self.constitution.validate_position_sizes(scaled_sizes, state)
             
-            # 4. Limit Check
-            final_size = self.constitution.validate_position_size(symbol, scaled_size, state)
-            approved_positions[symbol] = final_size
-            
-        return approved_positions
+        return dict(zip(symbols, final_sizes.tolist()))
@@ -148,7 +148,7 @@ if __name__ == "__main__":
     cache = CacheManager()
     
     # Example: Cache processed features
-    source_files = ["data/raw/commodities_raw.csv", "data/raw/macro_raw.csv"]
+    source_files = ["data/raw/commodities_raw.parquet", "data/raw/macro_raw.parquet"]
     cache_key = "feature_store_v1"
     
     if cache.is_cache_valid(cache_key, source_files):
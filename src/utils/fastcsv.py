@@ -0,0 +1,42 @@
+import os
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
+
+def _csv_table(df: pd.DataFrame, index: bool) -> pa.Table:
+    """
+    Arrow table laid out the way DataFrame.to_csv would write it: index as the
+    first column, dates without a time part, timestamps without nanoseconds.
+    """
+    if index:
+        df = df.reset_index(names=[name if name is not None else "" for name in df.index.names])
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    for i, field in enumerate(table.schema):
+        if not pa.types.is_timestamp(field.type) or field.type.tz is not None:
+            continue
+        values = df.iloc[:, i].dropna()
+        if (values == values.dt.normalize()).all():
+            target = pa.date32()
+        elif (values == values.dt.floor('s')).all():
+            target = pa.timestamp('s')
+        else:
+            continue
+        table = table.set_column(i, field.name, table.column(i).cast(target))
+    return table
+
+def write_csv(df: pd.DataFrame, path: str, index: bool = True, batch_size: int = 65536):
+    """
+    Writes df as CSV with pyarrow's multithreaded C writer instead of the
+    per-cell Python formatter behind DataFrame.to_csv; the file reads back
+    the same with pd.read_csv. Columns Arrow cannot type (mixed objects) fall
+    back to to_csv. Written to a temp file and renamed into place.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        table = _csv_table(df, index)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        df.to_csv(tmp_path, index=index)
+    else:
+        pacsv.write_csv(table, tmp_path, write_options=pacsv.WriteOptions(batch_size=batch_size))
+    os.replace(tmp_path, path)
@@ -0,0 +1,39 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+def _default(obj):
+    """Fallback for types neither library encodes natively."""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"): # numpy arrays and scalars
+        return obj.tolist()
+    return str(obj)
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serializes to UTF-8 JSON bytes with orjson when installed (datetimes as
+    ISO 8601, numpy arrays and scalars natively). pretty=True indents by
+    2 spaces; use it only for files meant to be read by people.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    text = json.dumps(obj, default=_default, indent=2 if pretty else None,
+                      separators=None if pretty else (",", ":"))
+    return text.encode("utf-8")
+
+def loads(data: Union[bytes, str]) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,39 @@
+import unittest
+import tempfile
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from features.event_alignment import align_news_to_inflections
+
+class TestEventAlignment(unittest.TestCase):
+    def test_window_and_commodity_matching(self):
+        """Every in-window pair is kept; untagged news matches any commodity."""
+        tmp = tempfile.mkdtemp()
+        news_path = os.path.join(tmp, "news.csv")
+        inf_path = os.path.join(tmp, "inflections.csv")
+
+        pd.DataFrame({
+            'timestamp_utc': ['2024-01-02 09:00', '2024-01-03 15:30', '2024-01-10 12:00', '2024-01-04 08:00'],
+            'commodity': ['GOLD', None, 'GOLD', 'SILVER'],
+            'headline': ['a', 'b', 'c', 'd'],
+            'source': ['s1', 's2', 's3', 's4']
+        }).to_csv(news_path, index=False)
+        pd.DataFrame({
+            'commodity': ['SILVER', 'GOLD'],
+            'move_type': ['down', 'up'],
+            'magnitude': [2.0, 3.0]
+        }, index=pd.to_datetime(['2024-01-04', '2024-01-02'])).to_csv(inf_path)
+
+        aligned = align_news_to_inflections(news_path, inf_path, window_days=1)
+
+        # Grouped by inflection row (file order), news in file order within each
+        self.assertEqual(list(aligned['headline']), ['b', 'd', 'a', 'b'])
+        self.assertEqual(list(aligned['commodity']), ['SILVER', 'SILVER', 'GOLD', 'GOLD'])
+        self.assertEqual(aligned['inflection_date'].iloc[2], pd.Timestamp('2024-01-02'))
+        self.assertEqual(aligned['news_date'].iloc[1], pd.Timestamp('2024-01-04'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from features.inflection_points import detect_inflection_points, detect_all_inflection_points
+
+class TestInflectionPoints(unittest.TestCase):
+    def test_batch_sweep_matches_per_commodity(self):
+        """The fused kernel flags the same days, thresholds and values as the per-commodity path."""
+        rng = np.random.default_rng(3)
+        T = 500
+        df = pd.DataFrame(index=pd.date_range("2020-01-01", periods=T))
+        for ticker in ("GC=F", "SI=F"):
+            returns = rng.standard_normal(T)
+            returns[rng.integers(0, T, 10)] = np.nan
+            df[f"{ticker}_ret_1d"] = returns
+            df[f"{ticker}_vol_20d"] = rng.random(T)
+
+        batch = detect_all_inflection_points(df, {"GOLD": "GC=F", "SILVER": "SI=F", "OIL": "CL=F"})
+
+        for name, ticker in (("GOLD", "GC=F"), ("SILVER", "SI=F")):
+            single = detect_inflection_points(df, ticker)
+            mine = batch[batch['commodity'] == name][single.columns]
+            pd.testing.assert_frame_equal(mine, single, check_freq=False)
+        self.assertTrue(batch.index.is_monotonic_increasing)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from features.market_features import calculate_volatility
+
+class TestMarketFeatures(unittest.TestCase):
+    def test_volatility_matches_pandas_rolling_std(self):
+        """Kernel volatility equals pct_change().rolling(w).std() * sqrt(252), gaps and flat runs included."""
+        rng = np.random.default_rng(0)
+        prices = np.exp(np.cumsum(rng.standard_normal((300, 3)) * 0.01, axis=0)) * 50
+        prices[:10, 0] = np.nan       # late listing
+        prices[100:105, 1] = np.nan   # gap, padded over
+        prices[150:200, 2] = prices[149, 2]  # flat run
+        df = pd.DataFrame(prices, columns=['GC=F', 'SI=F', 'CL=F'],
+                          index=pd.date_range('2024-01-01', periods=300))
+
+        vol = calculate_volatility(df, window=20)
+        expected = df.ffill().pct_change(fill_method=None).rolling(20).std() * np.sqrt(252)
+
+        self.assertEqual(list(vol.columns), ['GC=F_vol_20d', 'SI=F_vol_20d', 'CL=F_vol_20d'])
+        np.testing.assert_allclose(vol.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-12, equal_nan=True)
+        self.assertTrue((vol['CL=F_vol_20d'].iloc[170:200] == 0).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Mock src in path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from statsmodels.tsa.stattools import grangercausalitytests
+from src.intelligence.causality import CausalityEngine
+
+def test_granger_matches_statsmodels():
+    """
+    Hand-rolled SSR F-test p-values equal statsmodels' for every lag.
+    """
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2022-01-03", periods=120)
+    sentiment = rng.standard_normal(len(dates))
+    prices = 100 * np.cumprod(1 + 0.01 * rng.standard_normal(len(dates)))
+    market_df = pd.DataFrame({'close': prices, 'commodity': 'GOLD'}, index=dates)
+    news_df = pd.DataFrame({'timestamp_utc': dates, 'sentiment_score': sentiment, 'commodity': 'GOLD'})
+
+    p_values = CausalityEngine(market_df, news_df).test_granger_causality('GOLD', max_lag=3)
+
+    returns = market_df['close'].pct_change()
+    df = pd.concat([returns, pd.Series(sentiment, index=dates)], axis=1).dropna()
+    expected = grangercausalitytests(df.to_numpy(), maxlag=3)
+    assert list(p_values) == [1, 2, 3]
+    for lag, p in p_values.items():
+        assert abs(p - expected[lag][0]['ssr_ftest'][1]) < 1e-10
@@ -0,0 +1,45 @@
+import unittest
+import json
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from data_ingestion._async_yf import _chart_frame, _chart_params
+
+def _payload(timestamps, close, adjclose):
+    return json.dumps({"chart": {"result": [{
+        "meta": {"exchangeTimezoneName": "America/New_York"},
+        "timestamp": timestamps,
+        "indicators": {
+            "quote": [{"open": close, "high": close, "low": close, "close": close, "volume": [10, None]}],
+            "adjclose": [{"adjclose": adjclose}]
+        }
+    }], "error": None}}).encode()
+
+class TestAsyncChart(unittest.TestCase):
+    def test_daily_frame_is_adjusted_and_dated_in_exchange_time(self):
+        # 2024-01-02/03 09:30 New York
+        content = _payload([1704205800, 1704292200], [100.0, None], [50.0, None])
+        df = _chart_frame(content, "1d")
+
+        self.assertEqual(list(df.index), [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")])
+        self.assertEqual(df.index.name, "Date")
+        self.assertEqual(list(df.columns), ['Open', 'High', 'Low', 'Close', 'Volume'])
+        self.assertAlmostEqual(df['Open'].iloc[0], 50.0)
+        self.assertAlmostEqual(df['Close'].iloc[0], 50.0)
+        self.assertTrue(np.isnan(df['Close'].iloc[1]))
+
+        intraday = _chart_frame(content, "1h")
+        self.assertEqual(str(intraday.index.tz), "UTC")
+        self.assertIsNone(_chart_frame(b'{"chart": {"result": null}}', "1d"))
+
+    def test_params_mirror_download_arguments(self):
+        params = _chart_params(start="2024-01-01", end="2024-01-02")
+        self.assertEqual(params["period2"] - params["period1"], 86400)
+        self.assertEqual(_chart_params(period="60d", interval="1h")["range"], "60d")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from backtest.engine import BacktestEngine
+
+class TestBacktestEngine(unittest.TestCase):
+    def setUp(self):
+        self.dates = pd.date_range("2024-01-01", periods=6, freq='B')
+        self.prices = pd.DataFrame({
+            'GOLD': [100.0, 110.0, 120.0, 100.0, 90.0, 100.0],
+            'SILVER': [10.0, 10.0, 11.0, 12.0, 12.0, 13.0]
+        }, index=self.dates)
+
+    def test_frictionless_mark_to_market(self):
+        """Equity tracks held quantity * price between rebalances."""
+        allocs = pd.DataFrame({
+            'date': [self.dates[0], self.dates[3]],
+            'asset': ['GOLD', 'GOLD'],
+            'weight': [1.0, 0.0]
+        })
+        engine = BacktestEngine(initial_capital=100_000, commission_bps=0, slippage_bps=0)
+        history = engine.run_backtest(self.prices, allocs)
+
+        # 1000 oz bought at 100, marked pre-trade each bar, flat from bar 3
+        np.testing.assert_allclose(
+            history['equity'].to_numpy(),
+            [100_000, 110_000, 120_000, 100_000, 100_000, 100_000]
+        )
+        np.testing.assert_allclose(history['GOLD'].to_numpy(), [0, 1000, 1000, 1000, 0, 0], atol=1e-9)
+        self.assertTrue((history['SILVER'] == 0).all())
+        self.assertEqual(len(engine.trades), 2)
+        self.assertAlmostEqual(engine.trades[0].quantity, 1000.0)
+
+    def test_costs_and_unknown_assets(self):
+        """Commission and slippage reduce cash; unknown assets are skipped."""
+        allocs = pd.DataFrame({
+            'date': [self.dates[0], self.dates[0]],
+            'asset': ['SILVER', 'UNKNOWN'],
+            'weight': [0.5, 0.5]
+        })
+        engine = BacktestEngine(initial_capital=100_000, commission_bps=10, slippage_bps=5)
+        history = engine.run_backtest(self.prices, allocs)
+
+        # Buy 50,000 of SILVER: commission 50, fill at 10 * 1.0005
+        self.assertAlmostEqual(history['cash'].iloc[1], 100_000 - 50_000 - 50)
+        self.assertEqual(len(engine.trades), 1)
+        self.assertAlmostEqual(engine.trades[0].price, 10.005)
+        self.assertAlmostEqual(engine.trades[0].quantity, 50_000 / 10.005)
+        self.assertAlmostEqual(
+            history['equity'].iloc[-1],
+            history['cash'].iloc[-1] + engine.trades[0].quantity * 13.0
+        )
+
+    def test_engine_is_reentrant(self):
+        """Repeated runs on one engine start from scratch and match the array core."""
+        allocs = pd.DataFrame({
+            'date': [self.dates[0], self.dates[2]],
+            'asset': ['GOLD', 'SILVER'],
+            'weight': [0.6, 0.3]
+        })
+        engine = BacktestEngine(initial_capital=100_000, commission_bps=10, slippage_bps=5)
+        first = engine.run_backtest(self.prices, allocs.copy())
+        first_trades = list(engine.trades)
+        second = engine.run_backtest(self.prices, allocs.copy())
+        
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(engine.trades, first_trades)
+        
+        weights = np.full(self.prices.shape, np.nan)
+        weights[0, 0], weights[2, 1] = 0.6, 0.3
+        out = BacktestEngine.run(
+            self.prices.to_numpy(), ~np.isnan(weights).all(axis=1), weights, engine.params
+        )
+        np.testing.assert_allclose(out["equity"], first['equity'].to_numpy())
+        self.assertAlmostEqual(out["final_cash"], engine.cash)
+
+    def test_float32_matrices_track_float64(self):
+        """float32 storage keeps positions in float32 and equity within tolerance."""
+        allocs = pd.DataFrame({
+            'date': [self.dates[0], self.dates[3]],
+            'asset': ['GOLD', 'SILVER'],
+            'weight': [0.7, 0.2]
+        })
+        h64 = BacktestEngine().run_backtest(self.prices, allocs.copy())
+        h32 = BacktestEngine(dtype=np.float32).run_backtest(self.prices, allocs.copy())
+        
+        self.assertEqual(h32['GOLD'].dtype, np.float32)
+        self.assertEqual(h32['equity'].dtype, np.float64)
+        np.testing.assert_allclose(h32['equity'], h64['equity'], rtol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import os
+import tempfile
+import pandas as pd
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from data_ingestion.bse_fetcher import BSEHistoricalFetcher
+
+class TestBSEFetcher(unittest.TestCase):
+    def test_blank_volume_and_high_prices_parse(self):
+        """A blank volume cell keeps the day; prices keep paisa precision."""
+        tmp = tempfile.mkdtemp()
+        fetcher = BSEHistoricalFetcher(output_dir=tmp)
+        path = os.path.join(tmp, "20240102.csv")
+        with open(path, "w") as f:
+            f.write("TckrSymb,FinInstrmNm,OpnPric,HghPric,LwPric,ClsPric,TtlTradgVol,Other\n"
+                    "MRF,MRF LTD,130001.05,131234.55,129876.15,130987.65,1200,x\n"
+                    "ABC,ABC LTD,10.5,11.0,10.25,10.75,,y\n")
+
+        df = fetcher._read_day(path, pd.Timestamp("2024-01-02"))
+
+        self.assertEqual(list(df.columns), BSEHistoricalFetcher.REQUIRED_COLS)
+        self.assertEqual(df['CLOSE'].iloc[0], 130987.65)
+        self.assertEqual(df['NO_OF_SHRS'].iloc[0], 1200)
+        self.assertTrue(pd.isna(df['NO_OF_SHRS'].iloc[1]))
+
+        fetcher._save_data(df)
+        stored = pd.read_parquet(fetcher.output_path)
+        self.assertEqual(stored['CLOSE'].max(), 130987.65)
+        self.assertEqual(int(stored['NO_OF_SHRS'].isna().sum()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
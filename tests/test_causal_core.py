@@ -1,5 +1,6 @@
 import unittest
 import pandas as pd
+import numpy as np
 import sys
 import os
 from datetime import datetime
@@ -7,7 +8,7 @@ from datetime import datetime
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from core.time_index import causal_slice, apply_causal_mask
+from core.time_index import causal_slice, apply_causal_mask, CausalFrame
 from core.contracts import FeatureMetadata
 from models.validation import WalkForwardSplitter
 
@@ -23,6 +24,13 @@ class TestCausalCore(unittest.TestCase):
         self.assertEqual(len(sliced), 3)
         self.assertEqual(sliced.index.max(), cutoff)
         self.assertNotIn(4, sliced['value'].values)
+        
+        # Unsorted index falls back to the mask and keeps row order
+        shuffled = df.iloc[[3, 0, 4, 2, 1]]
+        self.assertEqual(list(causal_slice(shuffled, cutoff)['value']), [0, 2, 1])
+        # Cutoff between bars and before the first bar
+        self.assertEqual(len(causal_slice(df, "2023-01-03 12:00")), 3)
+        self.assertTrue(causal_slice(df, "2022-12-31").empty)
 
     def test_apply_causal_mask(self):
         df = pd.DataFrame({'value': [1, 2, 3]})
@@ -31,6 +39,20 @@ class TestCausalCore(unittest.TestCase):
         self.assertTrue(pd.isna(shifted.iloc[0, 0]))
         self.assertEqual(shifted.iloc[1, 0], 1.0)
 
+    def test_causal_frame_matches_shift(self):
+        dates = pd.date_range(start="2023-01-01", periods=5, freq='D')
+        df = pd.DataFrame({'a': np.arange(5.0), 'b': np.arange(5.0) * 10}, index=dates)
+        shifted = apply_causal_mask(df, shift_count=2)
+        frame = CausalFrame(df.iloc[::-1], shift_count=2)
+        
+        for t in dates:
+            np.testing.assert_array_equal(frame[t], shifted.loc[t].to_numpy())
+        # Between bars the last bar at or before t applies
+        np.testing.assert_array_equal(frame["2023-01-04 06:00"], [1.0, 10.0])
+        np.testing.assert_array_equal(frame.window(dates[-1], 2), [[1.0, 10.0], [2.0, 20.0]])
+        self.assertEqual(len(frame.window(dates[0])), 0)
+        self.assertTrue(np.shares_memory(frame.window(dates[-1]), frame.window(dates[-1], 1)))
+
     def test_feature_metadata_validation(self):
         # Valid metadata
         valid = FeatureMetadata(
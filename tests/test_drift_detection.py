@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scipy.stats import ks_2samp
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from governance.drift_detection import DriftDetector
+
+class TestDriftDetection(unittest.TestCase):
+    def test_matches_scipy_ks(self):
+        """Statistic and p-value agree with ks_2samp's default (exact for small samples), ties and NaNs included."""
+        rng = np.random.default_rng(0)
+        reference = pd.DataFrame(rng.standard_normal((500, 3)).round(1), columns=['a', 'b', 'c'])
+        current = pd.DataFrame(rng.standard_normal((200, 3)).round(1) + [0.0, 0.0, 1.0], columns=['a', 'b', 'c'])
+        reference.iloc[5, 0] = np.nan
+
+        results = DriftDetector(reference).check_drift(current, ['a', 'b', 'c', 'missing'])
+
+        self.assertEqual(list(results), ['a', 'b', 'c'])
+        for col in ['a', 'b', 'c']:
+            expected = ks_2samp(reference[col].dropna(), current[col])
+            self.assertAlmostEqual(results[col]['ks_stat'], expected.statistic, places=12)
+            self.assertAlmostEqual(results[col]['p_value'], expected.pvalue, places=12)
+        self.assertTrue(results['c']['drift_detected'])
+
+    def test_large_samples_use_asymptotic_kernel(self):
+        """Above the exact range the kernel matches ks_2samp(method='asymp')."""
+        rng = np.random.default_rng(1)
+        reference = pd.DataFrame({'a': rng.standard_normal(12000).round(2)})
+        current = pd.DataFrame({'a': rng.standard_normal(11000).round(2) + 0.02})
+
+        result = DriftDetector(reference).check_drift(current, ['a'])['a']
+
+        expected = ks_2samp(reference['a'], current['a'], method='asymp')
+        self.assertAlmostEqual(result['ks_stat'], expected.statistic, places=12)
+        self.assertAlmostEqual(result['p_value'], expected.pvalue, places=12)
+
+if __name__ == '__main__':
+    unittest.main()
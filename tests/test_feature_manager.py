@@ -0,0 +1,46 @@
+import unittest
+import tempfile
+import shutil
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from features.feature_manager import FeatureStoreManager
+from core.contracts import FeatureMetadata
+
+class TestFeatureStoreManager(unittest.TestCase):
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        self.manager = FeatureStoreManager(self.base_path)
+        self.df = pd.DataFrame({'GC=F_ret_1d': np.arange(6.0)},
+                               index=pd.DatetimeIndex(pd.date_range("2019-12-29", periods=6), name="Date"))
+        self.meta = FeatureMetadata(feature_set_id="fs", version="v1",
+                                    columns=list(self.df.columns), parameters={})
+
+    def tearDown(self):
+        shutil.rmtree(self.base_path, ignore_errors=True)
+
+    def test_year_partitions_round_trip_and_prune(self):
+        self.manager.save_feature_set(self.df, self.meta)
+        data_path, meta_path = self.manager._get_paths("fs", "v1")
+        self.assertEqual(sorted(os.listdir(data_path)), ["year=2019", "year=2020"])
+        # Metadata is embedded in the Parquet files; no sidecar
+        self.assertFalse(os.path.exists(meta_path))
+
+        loaded, meta = self.manager.load_feature_set("fs", "v1")
+        pd.testing.assert_frame_equal(loaded, self.df, check_freq=False)
+        self.assertEqual(meta.columns, ["GC=F_ret_1d"])
+
+        recent, _ = self.manager.load_feature_set("fs", "v1", min_year=2020)
+        self.assertEqual(recent.index.min(), pd.Timestamp("2020-01-01"))
+
+        # Re-saving replaces the dataset instead of appending to it
+        self.manager.save_feature_set(self.df.iloc[-2:], self.meta)
+        loaded, _ = self.manager.load_feature_set("fs", "v1")
+        self.assertEqual(len(loaded), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,6 +25,15 @@ class TestNewsIntelligence(unittest.TestCase):
         self.assertIn('sent_mean', agg.columns)
         self.assertGreater(agg['sent_mean'].iloc[0], 0)
 
+    def test_sentiment_batch_matches_single(self):
+        processor = NLPProcessor(backend="vader")
+        headlines = ['Gold is GREAT!', 'Oil prices crash badly', 'Copper flat']
+        
+        batch = processor.get_sentiment_batch(headlines)
+        
+        self.assertEqual(batch, [processor.get_sentiment(h) for h in headlines])
+        self.assertEqual(processor.get_sentiment_batch([]), [])
+
     def test_lead_lag_discovery(self):
         """
         Verify that the engine discovers a known lead signal.
@@ -13,6 +13,8 @@ from core.state_store import StateStore
 from ops.health import HealthMonitor
 from ops.drift import DriftDetector
 from ops.circuit_breaker import CircuitBreaker, CircuitState
+from ops.live_log import tail_lines, parse_live_logs
+from core.arrow_cache import get_table, write_sidecar
 
 class TestOperationalIntegrity(unittest.TestCase):
     
@@ -36,6 +38,42 @@ class TestOperationalIntegrity(unittest.TestCase):
         finally:
             os.unlink(temp_path)
     
+    def test_state_store_batch_update(self):
+        """Test that update() persists several keys in one atomic write."""
+        temp_dir = tempfile.mkdtemp()
+        temp_path = os.path.join(temp_dir, "state.json")
+        
+        store1 = StateStore(temp_path)
+        store1.update({"a": 1, "b": {"nested": True}})
+        
+        store2 = StateStore(temp_path)
+        self.assertEqual(store2.get("a"), 1)
+        self.assertEqual(store2.get("b"), {"nested": True})
+        self.assertIn("last_updated", store2.get_all())
+        self.assertFalse(os.path.exists(temp_path + ".tmp"))
+    
+    def test_state_store_skips_noop_writes(self):
+        """Setting a key to its current value does not rewrite the file."""
+        temp_dir = tempfile.mkdtemp()
+        temp_path = os.path.join(temp_dir, "state.json")
+        
+        store = StateStore(temp_path)
+        store.set("a", 1)
+        stamp = store.get("last_updated")
+        os.unlink(temp_path)
+        
+        store.set("a", 1)
+        self.assertFalse(os.path.exists(temp_path))
+        self.assertEqual(store.get("last_updated"), stamp)
+        
+        store.set("a", 2)
+        self.assertEqual(StateStore(temp_path).get("a"), 2)
+        
+        # A caller-supplied timestamp is used for both the checkpoint and last_updated
+        store.update_checkpoint("job", "success", now="2024-01-02T03:04:05")
+        self.assertEqual(store.get("checkpoint_job")["timestamp"], "2024-01-02T03:04:05")
+        self.assertEqual(store.get("last_updated"), "2024-01-02T03:04:05")
+    
     def test_health_monitor_freshness(self):
         """Test data freshness checking."""
         monitor = HealthMonitor()
@@ -117,5 +155,49 @@ class TestOperationalIntegrity(unittest.TestCase):
         self.assertEqual(result, "success")
         self.assertEqual(breaker.state, CircuitState.CLOSED)
 
+    def test_live_log_tail_parsing(self):
+        """Test that the live log is parsed newest-first from the tail."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            for i in range(50):
+                f.write(f"2026-01-18 10:{i:02d}:00,000 [INFO] live_intelligence: "
+                        f"PREDICTION (Gold 1d): Med=0.{i:04d}% | Range=[-0.5000%, 0.7000%]\n")
+            f.write("2026-01-18 11:00:00,000 [INFO] live_intelligence: "
+                    "!!! SHOCK DETECTED: GC=F moved -1.20% at 2026-01-18 11:00:00\n")
+            temp_path = f.name
+        
+        try:
+            lines = list(tail_lines(temp_path, max_lines=100))
+            self.assertEqual(len(lines), 51)
+            self.assertIn("SHOCK DETECTED", lines[0])
+            self.assertIn("Med=0.0000%", lines[-1])
+            
+            predictions, shocks = parse_live_logs(temp_path, max_predictions=5)
+            self.assertEqual(len(predictions), 5)
+            self.assertAlmostEqual(predictions[0]["p50"], 0.0049 / 100)
+            self.assertEqual(shocks[0]["ticker"], "GC=F")
+            self.assertEqual(shocks[0]["type"], "NEGATIVE_SHOCK")
+            self.assertAlmostEqual(shocks[0]["magnitude"], -0.012)
+        finally:
+            os.unlink(temp_path)
+
+    def test_arrow_cache_reuses_table_until_mtime_changes(self):
+        """Test that get_table parses once per mtime and sidecars round-trip."""
+        temp_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(temp_dir, "prices.csv")
+        pd.DataFrame({"a": [1, 2, 3]}).to_csv(csv_path, index=False)
+        
+        first = get_table(csv_path)
+        self.assertIs(get_table(csv_path), first)
+        
+        pd.DataFrame({"a": [4, 5]}).to_csv(csv_path, index=False)
+        os.utime(csv_path, (0, os.path.getmtime(csv_path) + 10))
+        second = get_table(csv_path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second["a"].to_pylist(), [4, 5])
+        
+        sidecar = write_sidecar(csv_path)
+        self.assertTrue(sidecar.endswith("prices.parquet"))
+        self.assertTrue(get_table(sidecar).equals(second))
+
 if __name__ == '__main__':
     unittest.main()
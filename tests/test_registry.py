@@ -20,8 +20,9 @@ class TestModelRegistry(unittest.TestCase):
         self.registry = ModelRegistry(self.temp_path)
     
     def tearDown(self):
-        if os.path.exists(self.temp_path):
-            os.unlink(self.temp_path)
+        for path in (self.temp_path, self.registry.log_path):
+            if os.path.exists(path):
+                os.unlink(path)
     
     def test_register_model(self):
         """Test model registration."""
@@ -86,6 +87,110 @@ class TestModelRegistry(unittest.TestCase):
         v1 = self.registry.get_model("tcn_gold_v1")
         self.assertEqual(v1['status'], 'retired')
     
+    def test_indices_survive_reload(self):
+        """Reloading from disk rebuilds the id, family and champion indices."""
+        for version in ("v1", "v2"):
+            self.registry.register(ModelMetadata(
+                model_id=f"tcn_gold_{version}",
+                version="1.0",
+                model_path=f"/path/to/{version}.pth",
+                feature_set_version="v1",
+                feature_hash="abc123",
+                training_window={"start": "2020-01-01", "end": "2023-12-31"},
+                hyperparameters={},
+                metrics={"val_loss": 0.10}
+            ))
+        self.registry.promote_to_champion("tcn_gold_v2")
+        self.registry.update_metrics("tcn_gold_v1", {"val_loss": 0.07})
+        
+        reloaded = ModelRegistry(self.temp_path)
+        self.assertEqual(reloaded.get_champion("tcn_gold")['model_id'], "tcn_gold_v2")
+        self.assertEqual(reloaded.get_champion("tcn")['model_id'], "tcn_gold_v2")
+        self.assertIsNone(reloaded.get_champion("lstm"))
+        self.assertEqual(reloaded.get_model("tcn_gold_v1")['metrics']['val_loss'], 0.07)
+        self.assertEqual([m['model_id'] for m in reloaded.list_family("tcn_gold")],
+                         ["tcn_gold_v1", "tcn_gold_v2"])
+        with self.assertRaises(ValueError):
+            reloaded.update_metrics("missing_v1", {})
+    
+    def test_event_log_replay_and_compaction(self):
+        """Mutations append to the log; compaction folds it into the snapshot."""
+        self.registry.COMPACT_EVERY = 3
+        for version in ("v1", "v2"):
+            self.registry.register(ModelMetadata(
+                model_id=f"lstm_oil_{version}",
+                version="1.0",
+                model_path=f"/path/to/{version}.pth",
+                feature_set_version="v1",
+                feature_hash="abc123",
+                training_window={"start": "2020-01-01", "end": "2023-12-31"},
+                hyperparameters={},
+                metrics={"val_loss": 0.10}
+            ))
+        with open(self.registry.log_path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(os.path.getsize(self.temp_path), 0)
+        
+        # Third event triggers compaction
+        self.registry.promote_to_champion("lstm_oil_v1")
+        self.assertEqual(os.path.getsize(self.registry.log_path), 0)
+        with open(self.temp_path) as f:
+            self.assertEqual(len(json.load(f)), 2)
+        
+        self.registry.update_metrics("lstm_oil_v1", {"sharpe": 1.1})
+        reloaded = ModelRegistry(self.temp_path)
+        self.assertEqual(reloaded.list_models(), self.registry.list_models())
+        self.assertEqual(reloaded.get_champion("lstm_oil")['metrics']['sharpe'], 1.1)
+    
+    def test_torn_log_tail_is_cut_before_next_append(self):
+        """Events appended after a crash mid-write survive the next reload."""
+        def metadata(version):
+            return ModelMetadata(
+                model_id=f"tcn_gold_{version}",
+                version="1.0",
+                model_path=f"/path/to/{version}.pth",
+                feature_set_version="v1",
+                feature_hash="abc123",
+                training_window={"start": "2020-01-01", "end": "2023-12-31"},
+                hyperparameters={},
+                metrics={"val_loss": 0.10}
+            )
+        self.registry.register(metadata("v1"))
+        with open(self.registry.log_path, 'ab') as f:
+            f.write(b'{"op": "register", "model": {"model_id": "tcn_go')
+        
+        recovered = ModelRegistry(self.temp_path)
+        recovered.register(metadata("v2"))
+        recovered.register(metadata("v3"))
+        
+        reloaded = ModelRegistry(self.temp_path)
+        self.assertEqual([m['model_id'] for m in reloaded.list_models()],
+                         ["tcn_gold_v1", "tcn_gold_v2", "tcn_gold_v3"])
+    
+    def test_legacy_snapshot_backfills_epoch_timestamps(self):
+        """Entries saved without *_ts companions get them parsed once on load."""
+        entry = {
+            "model_id": "tcn_gold_v1", "version": "1.0", "model_path": "/p",
+            "feature_set_version": "v1", "feature_hash": "abc",
+            "training_window": {}, "hyperparameters": {}, "metrics": {},
+            "created_at": "2024-01-01 00:00:00", "notes": None
+        }
+        models = [
+            dict(entry, status="champion", promoted_at="2024-01-02T00:00:00"),
+            dict(entry, model_id="tcn_gold_v2", status="champion", promoted_at="2024-01-03T00:00:00"),
+            dict(entry, model_id="tcn_gold_v0", status="candidate", promoted_at=None)
+        ]
+        with open(self.temp_path, 'w') as f:
+            json.dump(models, f)
+        
+        registry = ModelRegistry(self.temp_path)
+        self.assertEqual(registry.get_champion("tcn_gold")['model_id'], "tcn_gold_v2")
+        self.assertEqual(registry.get_model("tcn_gold_v1")['created_at_ts'], 1704067200.0)
+        self.assertIsNone(registry.get_model("tcn_gold_v0")['promoted_at_ts'])
+        
+        registry.promote_to_champion("tcn_gold_v0", now="2024-01-04T00:00:00")
+        self.assertEqual(registry.get_model("tcn_gold_v0")['promoted_at_ts'], 1704326400.0)
+    
     def test_model_selector_comparison(self):
         """Test model comparison logic."""
         # Register models
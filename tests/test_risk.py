@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from core.risk import RiskProfile, CapitalConstitution, PortfolioState
 
 class TestRiskConstitution(unittest.TestCase):
@@ -69,6 +70,12 @@ class TestRiskConstitution(unittest.TestCase):
         # Request -60,000
         approved_short = self.constitution.validate_position_size("TEST", -60000, state)
         self.assertEqual(approved_short, -50000)
+        
+        # Batch form clamps every symbol at once
+        approved_batch = self.constitution.validate_position_sizes(
+            np.array([80000.0, -60000.0, 20000.0, 0.0]), state
+        )
+        np.testing.assert_array_equal(approved_batch, [50000, -50000, 20000, 0])
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from sklearn.linear_model import LinearRegression
+from models.baseline import OLSBaseline
+from backtest.walk_forward import WalkForwardSplitter, get_walk_forward_bounds, get_walk_forward_splits, run_backtest
+
+class ColumnCheckingModel(LinearRegression):
+    """Fails unless fit/predict see the feature DataFrame and target Series."""
+    def fit(self, X, y):
+        assert list(X.columns) == ['f1'] and y.name == 'target'
+        return super().fit(X, y)
+        
+    def predict(self, X):
+        assert list(X.columns) == ['f1']
+        return super().predict(X)
+
+class TestWalkForward(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        idx = pd.date_range("2010-01-01", "2014-12-31", freq='D')
+        self.df = pd.DataFrame({'f1': rng.normal(size=len(idx))}, index=idx)
+        self.df['target'] = 0.5 * self.df['f1'] + rng.normal(scale=0.1, size=len(idx))
+        self.config = {"start_year": 2010, "train_size_years": 2, "test_size_years": 1}
+
+    def test_bounds_match_calendar_years(self):
+        """Each split trains on all prior years and tests on exactly one year."""
+        bounds = get_walk_forward_bounds(self.df.index, self.config)
+        self.assertEqual([b[0] for b in bounds], [2012, 2013, 2014])
+        
+        for year, train_lo, train_hi, test_lo, test_hi in bounds:
+            self.assertEqual(train_lo, 0)
+            self.assertEqual(train_hi, test_lo)
+            self.assertEqual(self.df.index[train_hi - 1].year, year - 1)
+            self.assertTrue((self.df.index[test_lo:test_hi].year == year).all())
+
+    def test_splits_sort_unsorted_input(self):
+        """Legacy dict splits come back sorted even for a shuffled frame."""
+        shuffled = self.df.sample(frac=1, random_state=0)
+        splits = get_walk_forward_splits(shuffled, self.config)
+        self.assertTrue(splits[0]["test"].equals(self.df.loc["2012"]))
+
+    def test_run_backtest_serial(self):
+        """In-process run returns per-year metrics and stacked arrays."""
+        results, preds, actuals = run_backtest(
+            LinearRegression, self.df, 'target', ['f1'], self.config, max_workers=1
+        )
+        self.assertEqual([r["year"] for r in results], [2012, 2013, 2014])
+        self.assertEqual(len(preds), len(actuals))
+        self.assertEqual(len(actuals), len(self.df.loc["2012":"2014"]))
+        self.assertTrue(all(r["ic"] > 0.9 for r in results))
+
+    def test_models_receive_frames_in_process_by_default(self):
+        """Default run is in-process and models get named columns."""
+        results, _, _ = run_backtest(ColumnCheckingModel, self.df, 'target', ['f1'], self.config)
+        self.assertEqual([r["year"] for r in results], [2012, 2013, 2014])
+
+    def test_numba_ols_matches_linear_regression(self):
+        """The threaded prange path for OLSBaseline reproduces the serial LinearRegression run."""
+        df = self.df.copy()
+        df['f2'] = np.random.default_rng(7).normal(size=len(df))
+        df['target'] += 0.2 * df['f2']
+        
+        expected = run_backtest(LinearRegression, df, 'target', ['f1', 'f2'], self.config, max_workers=1)
+        results, preds, actuals = run_backtest(OLSBaseline, df, 'target', ['f1', 'f2'], self.config)
+        
+        np.testing.assert_allclose(preds, expected[1], rtol=1e-9, atol=1e-12)
+        np.testing.assert_array_equal(actuals, expected[2])
+        self.assertEqual([r["year"] for r in results], [r["year"] for r in expected[0]])
+        for got, want in zip(results, expected[0]):
+            for key in ("rmse", "mae", "ic"):
+                self.assertAlmostEqual(got[key], want[key], places=9)
+
+    def test_rolling_splitter_windows(self):
+        """Rolling folds are contiguous, step forward, and test right after train."""
+        folds = list(WalkForwardSplitter(train_window=365, test_window=90, step=90).split(self.df))
+        self.assertEqual(len(folds), 16)
+        
+        for k, (train, test) in enumerate(folds):
+            start = self.df.index[0] + pd.Timedelta(days=90 * k)
+            self.assertEqual(train.index[0], start)
+            self.assertEqual(train.index[-1], start + pd.Timedelta(days=365))
+            self.assertEqual(test.index[0], train.index[-1] + pd.Timedelta(days=1))
+            self.assertEqual(len(test), 90)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import tempfile
+import shutil
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from data_ingestion._cache import YFCache
+
+class TestYFCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_hit_within_ttl_and_miss_after(self):
+        cache = YFCache(self.cache_dir, ttl_sec=60)
+        key = YFCache.key(["SI=F", "GC=F"], start="2024-01-01", end="2024-02-01")
+        self.assertEqual(key, YFCache.key(["GC=F", "SI=F"], end="2024-02-01", start="2024-01-01"))
+        self.assertNotEqual(key, YFCache.key(["GC=F", "SI=F"], start="2024-01-02", end="2024-02-01"))
+
+        calls = []
+        def compute():
+            calls.append(1)
+            return pd.DataFrame({'Close': [1.0, 2.0]}, index=pd.date_range("2024-01-01", periods=2))
+
+        first = cache.get_or_compute(key, compute)
+        second = cache.get_or_compute(key, compute)
+        self.assertEqual(len(calls), 1)
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+        # Expired entries are recomputed; empty results are never stored
+        self.assertIsNone(YFCache(self.cache_dir, ttl_sec=0).get(key))
+        empty_key = YFCache.key(["XX"], period="5d")
+        cache.get_or_compute(empty_key, pd.DataFrame)
+        self.assertIsNone(cache.get(empty_key))
+
+if __name__ == '__main__':
+    unittest.main()